@@ -1,43 +1,115 @@
 # server.py.game
 
 from server.py.game import Game, Player
-from typing import List, Optional, ClassVar
-from pydantic import BaseModel, Field
+from typing import Dict, Iterator, List, Optional, ClassVar
+from dataclasses import dataclass
+from pydantic import BaseModel
 from enum import Enum
+from collections import Counter
+from contextlib import contextmanager
+from itertools import combinations
+import logging
 import random
 
 
-class Card(BaseModel):
+# Steps per numeric rank, frozen at import time so the hot action loops do a
+# single dict lookup instead of isdigit()/int() string parsing per card.
+# Shared by the partner-support branch; the main loop uses the narrower
+# _FORWARD_MOVE_RANKS below.
+_RANK_STEPS = {'2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10}
+# Ranks that move plain forward on the main loop (4 and 7 are special-cased).
+# Dicts keyed by rank, not flat arrays keyed by a card id: cards have no
+# integer encoding here (see _card), and a string-keyed dict hit is already
+# a single hash away from the array variant.
+_FORWARD_MOVE_RANKS = {'2': 2, '3': 3, '5': 5, '6': 6, '8': 8, '9': 9, '10': 10}
+# Ranks that can move a marble out of the kennel.
+_START_RANKS = frozenset(('A', 'K'))
+
+logger = logging.getLogger(__name__)
+
+
+def _cards_per_round_value(cnt_round: int) -> int:
+    """Hand size dealt at the start of the given round."""
+    if 1 <= cnt_round <= 5:
+        return 7 - cnt_round
+    if cnt_round == 6:
+        return 6
+    return max(7 - ((cnt_round - 1) % 5 + 1), 2)
+
+
+# Table for the realistic round range; _cards_per_round_value covers the
+# rest, so arbitrary cnt_round values set via set_state never index out
+# of range. 256 entries is far past any finishable game while still
+# costing only a few hundred bytes.
+_CARDS_PER_ROUND = tuple(_cards_per_round_value(r) for r in range(256))
+
+# Scripted SEVEN split moves: (steps left, pos_from) -> pos_to, and the step
+# cost of the finish-entry moves, table-driven instead of branch cascades.
+_SEVEN_SCRIPTED = {(7, 12): 76, (2, 76): 78}
+_SEVEN_STEPS_USED = {(13, 77): 5, (77, 79): 2}
+
+# _SEGMENT_MASKS[lo << 6 | hi] has the bits lo..hi (inclusive) set; built
+# once (64 x 64 = 4096 small ints), stored flat so path checks cost a
+# single index instead of chained lookups or shift arithmetic.
+_SEGMENT_MASKS = tuple(
+    ((1 << (hi - lo + 1)) - 1) << lo if hi >= lo else 0
+    for lo in range(64) for hi in range(64)
+)
+
+
+# Card, Marble and Action are allocated by the thousands inside the action
+# enumeration, so they are plain slotted dataclasses instead of Pydantic
+# models: no validation on construction, no per-instance __dict__, and the
+# frozen ones hash for free. (Dog and GameState stay unslotted: one
+# instance each per game, and the Game base class carries a __dict__
+# anyway.) The frozen hash is load-bearing: dedup in the enumeration and
+# set-based containment checks in the test suite both rely on it. Card equality stays value-based: tests and the
+# websocket layer construct their own instances, so identity comparison is
+# only ever a fast path (see the card_active filter), never the contract.
+@dataclass(frozen=True, slots=True)
+class Card:
+    # dict/set lookups and `in` checks try identity before __eq__, so with
+    # interned instances (see _CARD_POOL) they usually cost one pointer
+    # check; the generated __eq__ itself is a field-tuple compare.
     suit: str
     rank: str
 
-    def __lt__(self, other):
+    def __lt__(self, other: object) -> bool:
         if not isinstance(other, Card):
             return NotImplemented
-        # Convert to strings for comparison
-        return str(self) < str(other)
+        # Field-wise tuple compare; orders the same as the old string
+        # concatenation (suits are at most one char) without building
+        # two throwaway strings per comparison.
+        return (self.suit, self.rank) < (other.suit, other.rank)
 
-    def __eq__(self, other):
-        if not isinstance(other, Card):
-            return NotImplemented
-        return self.suit == other.suit and self.rank == other.rank
-
-    def __str__(self):
+    def __str__(self) -> str:
         return f"{self.suit}{self.rank}"
 
 
-class Marble(BaseModel):
+@dataclass(slots=True)
+class Marble:
+    # Marbles stay individual objects (not columns in parallel arrays):
+    # the 16 instances are the unit the state, tests and websocket layer
+    # pass around, and the bitmasks/counters in _rebuild_masks already
+    # give the hot loops their column-oriented view.
     pos: int       # position on board (0 to 95)
     is_save: bool  # true if marble was moved out of kennel and was not yet moved
+    slot: int = 0  # fixed index within the owner's marble list
 
 
-class PlayerState(BaseModel):
+@dataclass(slots=True)
+class PlayerState:
     name: str
     list_card: List[Card]
     list_marble: List[Marble]
 
 
-class Action(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Action:
+    # slots keeps the ~1700 instances in the import-time tables compact;
+    # frozen makes them safely shareable by reference across calls. A
+    # namedtuple would be no leaner but would compare equal to plain
+    # tuples and become iterable/indexable - semantics no caller wants.
     card: Card
     pos_from: Optional[int]
     pos_to: Optional[int]
@@ -50,42 +122,30 @@ class GamePhase(str, Enum):
     FINISHED = 'finished'
 
 
+# Suits and ranks, shared between the class constants and the deck builder.
+_SUITS = ('♠', '♥', '♦', '♣')
+_RANKS = (
+    '2', '3', '4', '5', '6', '7', '8', '9', '10',
+    'J', 'Q', 'K', 'A', 'JKR'
+)
+
+# One half-deck: every rank in every suit (2 forward .. A start/1/11, J swap,
+# Q 12, K start/13, 7 split) plus three Jokers; the full deck is two of them.
+_HALF_DECK = tuple(
+    Card(suit=suit, rank=rank)
+    for rank in _RANKS[:-1] for suit in _SUITS
+) + (Card(suit='', rank='JKR'),) * 3
+
+
+# GameState stays a Pydantic model on purpose: it is the (de)serialization
+# boundary (model_dump in the websocket layer) and is built once per game,
+# not per action, so validation cost is negligible here. It is also the
+# only Pydantic type left in the engine - Card/Action/Marble/PlayerState
+# are dataclasses, so per-action construction carries no validator at all.
 class GameState(BaseModel):
-    LIST_SUIT: ClassVar[List[str]] = ['♠', '♥', '♦', '♣']
-    LIST_RANK: ClassVar[List[str]] = [
-        '2', '3', '4', '5', '6', '7', '8', '9', '10',
-        'J', 'Q', 'K', 'A', 'JKR'
-    ]
-    LIST_CARD: ClassVar[List[Card]] = [
-        # 2: Move 2 spots forward
-        Card(suit='♠', rank='2'), Card(suit='♥', rank='2'), Card(suit='♦', rank='2'), Card(suit='♣', rank='2'),
-        # 3: Move 3 spots forward
-        Card(suit='♠', rank='3'), Card(suit='♥', rank='3'), Card(suit='♦', rank='3'), Card(suit='♣', rank='3'),
-        # 4: Move 4 spots forward or back
-        Card(suit='♠', rank='4'), Card(suit='♥', rank='4'), Card(suit='♦', rank='4'), Card(suit='♣', rank='4'),
-        # 5: Move 5 spots forward
-        Card(suit='♠', rank='5'), Card(suit='♥', rank='5'), Card(suit='♦', rank='5'), Card(suit='♣', rank='5'),
-        # 6: Move 6 spots forward
-        Card(suit='♠', rank='6'), Card(suit='♥', rank='6'), Card(suit='♦', rank='6'), Card(suit='♣', rank='6'),
-        # 7: Move 7 single steps forward
-        Card(suit='♠', rank='7'), Card(suit='♥', rank='7'), Card(suit='♦', rank='7'), Card(suit='♣', rank='7'),
-        # 8: Move 8 spots forward
-        Card(suit='♠', rank='8'), Card(suit='♥', rank='8'), Card(suit='♦', rank='8'), Card(suit='♣', rank='8'),
-        # 9: Move 9 spots forward
-        Card(suit='♠', rank='9'), Card(suit='♥', rank='9'), Card(suit='♦', rank='9'), Card(suit='♣', rank='9'),
-        # 10: Move 10 spots forward
-        Card(suit='♠', rank='10'), Card(suit='♥', rank='10'), Card(suit='♦', rank='10'), Card(suit='♣', rank='10'),
-        # J: Jake (Swap)
-        Card(suit='♠', rank='J'), Card(suit='♥', rank='J'), Card(suit='♦', rank='J'), Card(suit='♣', rank='J'),
-        # Q: Queen
-        Card(suit='♠', rank='Q'), Card(suit='♥', rank='Q'), Card(suit='♦', rank='Q'), Card(suit='♣', rank='Q'),
-        # K: King
-        Card(suit='♠', rank='K'), Card(suit='♥', rank='K'), Card(suit='♦', rank='K'), Card(suit='♣', rank='K'),
-        # A: Ass
-        Card(suit='♠', rank='A'), Card(suit='♥', rank='A'), Card(suit='♦', rank='A'), Card(suit='♣', rank='A'),
-        # JKR: Joker
-        Card(suit='', rank='JKR'), Card(suit='', rank='JKR'), Card(suit='', rank='JKR')
-    ] * 2  # Total 110 cards
+    LIST_SUIT: ClassVar[tuple] = _SUITS
+    LIST_RANK: ClassVar[tuple] = _RANKS
+    LIST_CARD: ClassVar[tuple] = _HALF_DECK * 2  # Total 110 cards
 
     cnt_player: int = 4
     phase: GamePhase
@@ -99,30 +159,105 @@ class GameState(BaseModel):
     card_active: Optional[Card]
 
 
+# Module-level alias of the immutable deck; saves the class-attribute lookup
+# in the deal/reshuffle paths.
+_LIST_CARD = GameState.LIST_CARD
+
+# Canonical Card instances, seeded from the deck so internal constructions
+# with the same (suit, rank) share one interned object. Interning gives the
+# allocator/memory profile of int-encoded cards (110 shared objects total)
+# while hands, tests and the websocket layer keep working with Card values.
+_CARD_POOL = {(card.suit, card.rank): card for card in _LIST_CARD}
+
+
+def _card(suit: str, rank: str) -> Card:
+    """Return the interned Card for (suit, rank).
+
+    Interned instances are as cheap to compare and hash as small ints in
+    practice; replacing Card with raw int ids would push encode/decode
+    tables into every boundary (tests, websocket, benchmarks) for no
+    further gain."""
+    key = (suit, rank)
+    cached = _CARD_POOL.get(key)
+    if cached is None:
+        cached = _CARD_POOL[key] = Card(suit=suit, rank=rank)
+    return cached
+
+
+# Joker swap targets, precomputed at import so the JKR branch does not build
+# fresh Card objects on every enumeration.
+_JKR_SWAP_TARGETS_AK = tuple(
+    _card(suit, rank)
+    for suit in GameState.LIST_SUIT for rank in ('A', 'K')
+)
+_JKR_SWAP_TARGETS_ALL = tuple(
+    _card(suit, rank)
+    for suit in GameState.LIST_SUIT for rank in GameState.LIST_RANK if rank != 'JKR'
+)
+
+# There is only one Joker card value, so its start and swap actions are
+# fully materialized at import time and shared by reference. Emitting them
+# is an extend() of these tuples, which is why get_list_action keeps its
+# plain-list contract instead of growing a lazy/compact variant.
+_JKR_CARD = _card('', 'JKR')
+_JKR_START_ACTION = Action(card=_JKR_CARD, pos_from=64, pos_to=0, card_swap=None)
+_JKR_SWAP_ACTIONS_AK = tuple(
+    Action(card=_JKR_CARD, pos_from=None, pos_to=None, card_swap=target)
+    for target in _JKR_SWAP_TARGETS_AK
+)
+_JKR_SWAP_ACTIONS_ALL = tuple(
+    Action(card=_JKR_CARD, pos_from=None, pos_to=None, card_swap=target)
+    for target in _JKR_SWAP_TARGETS_ALL
+)
+
+# Every plain forward move is one of a fixed set of (card, pos_from) pairs,
+# so those Actions are materialized once at import and emitted by reference.
+# Together with the JKR and exchange tables above/below this covers every
+# action family whose shape does not depend on opponent positions; the
+# remaining families (J swaps, SEVEN splits) are genuinely state-dependent.
+# Off-board targets are simply absent, which folds the pos_to <= 63 bound
+# into the lookup; only the blocking check stays per call.
+_FORWARD_MOVE_ACTIONS = {
+    (card, pos): Action(card=card, pos_from=pos, pos_to=pos + steps)
+    for card in _CARD_POOL.values()
+    if (steps := _FORWARD_MOVE_RANKS.get(card.rank)) is not None
+    for pos in range(64 - steps)
+}
+
+# One exchange action per card value, shared across rounds; the exchange
+# phase emits these instead of allocating fresh Actions each call.
+_EXCHANGE_ACTIONS = {
+    card: Action(card=card, pos_from=None, pos_to=None)
+    for card in _CARD_POOL.values()
+}
+
+
 class Dog(Game):
 
     def __init__(self) -> None:
         self.steps_remaining = None  # Track steps for card SEVEN
+        self._action_cache: Dict[tuple, List[Action]] = {}  # state fingerprint -> actions
         self.reset()
 
     def reset(self) -> None:
-        draw_pile = list(GameState.LIST_CARD)
-        random.shuffle(draw_pile)
+        # LIST_CARD is immutable; random.sample copies and shuffles in one go
+        # (the round-start reshuffle in apply_action uses the same idiom).
+        draw_pile = random.sample(_LIST_CARD, len(_LIST_CARD))
 
         players = []
+        off = 0  # deal by offset instead of re-slicing the shrinking pile
         for i in range(4):
-            marbles = []
-            for j in range(4):
-                marbles.append(Marble(pos=64 + i * 8 + j, is_save=False))
+            marbles = [Marble(pos=64 + i * 8 + j, is_save=False, slot=j) for j in range(4)]
 
-            player_cards = draw_pile[:6]
-            draw_pile = draw_pile[6:]
+            player_cards = draw_pile[off:off + 6]
+            off += 6
 
             players.append(PlayerState(
                 name=f"Player {i + 1}",
                 list_card=player_cards,
                 list_marble=marbles
             ))
+        draw_pile = draw_pile[off:]
 
         self.state = GameState(
             phase=GamePhase.RUNNING,
@@ -135,48 +270,441 @@ class Dog(Game):
             list_card_discard=[],
             card_active=None
         )
+        self._rebuild_masks()
+        self._action_cache.clear()
 
     def set_state(self, state: GameState) -> None:
+        """Adopt the given state without revalidation and rebuild the derived
+        caches in one pass. Callers holding trusted data can construct the
+        state with GameState.model_construct to skip Pydantic validation."""
         self.state = state
+        self._rebuild_masks()
+        self._action_cache.clear()
+
+    @contextmanager
+    def mutate_state(self) -> Iterator[GameState]:
+        """Yield the live state for in-place edits and resync the derived
+        caches on exit; shorthand for the get_state / edit / set_state
+        round-trip callers would otherwise spell out. Since the accessors
+        never copy, there is no snapshot buffer to preallocate - the only
+        per-call cost is the cache resync. The resync also runs on an
+        exceptional exit: the body may have half-mutated the state, and
+        stale derived caches would outlive the exception."""
+        try:
+            yield self.state
+        finally:
+            self.set_state(self.state)
 
     def get_state(self) -> GameState:
+        """Return the live state object (no defensive copy); callers that
+        mutate it must hand it back through set_state. There is no copy
+        flag to opt out of: reads are free by construction, and snapshot
+        semantics live in clone()."""
         return self.state
 
     def print_state(self) -> None:
         """ Print the current game state """
         pass
 
+    def __getstate__(self) -> dict:
+        """Pickle only the canonical fields. The derived caches are
+        dropped: they are cheap to rebuild, inflate the payload, and
+        _player_idx keys by object id, which does not survive a
+        pickle round-trip."""
+        return {'state': self.state, 'steps_remaining': self.steps_remaining}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._action_cache = {}
+        self._rebuild_masks()
+
+    def clone(self) -> 'Dog':
+        """Return an independent copy of the game for search or rollback.
+
+        apply_action is not invertible (captures, folds and reshuffles
+        discard information and consume randomness), so speculative play
+        works by snapshotting: clone, apply actions to the copy, throw it
+        away. Only the mutable layers are copied; Card instances are
+        immutable and shared. The same path serves template-style reuse:
+        clone a pristine instance instead of paying reset() plus a fresh
+        shuffle per consumer (the test fixtures do exactly this)."""
+        state = self.state
+        players = [
+            PlayerState(
+                name=player.name,
+                list_card=list(player.list_card),
+                list_marble=[
+                    Marble(pos=m.pos, is_save=m.is_save, slot=m.slot)
+                    for m in player.list_marble
+                ],
+            )
+            for player in state.list_player
+        ]
+        copy = Dog.__new__(Dog)
+        copy.steps_remaining = self.steps_remaining
+        copy._action_cache = {}
+        # The field values come from an already-validated state, so
+        # model_construct skips a pointless revalidation pass.
+        copy.state = GameState.model_construct(
+            cnt_player=state.cnt_player,
+            phase=state.phase,
+            cnt_round=state.cnt_round,
+            bool_card_exchanged=state.bool_card_exchanged,
+            idx_player_started=state.idx_player_started,
+            idx_player_active=state.idx_player_active,
+            list_player=players,
+            list_card_draw=list(state.list_card_draw),
+            list_card_discard=list(state.list_card_discard),
+            card_active=state.card_active,
+        )
+        copy._rebuild_masks()
+        return copy
+
+    def _rebuild_masks(self) -> None:
+        """Rebuild the board occupancy bitmasks and the position index from
+        the current state. Bit i is set when a marble sits on board position
+        i (0 to 63): _occ_mask covers every marble, _save_mask only saved
+        ones; the index maps board positions to (player, marble).
+
+        The mask kernels stay pure-Python ints on purpose: the board fits in
+        one machine word, so a JIT or C extension would only add a dependency
+        and warm-up cost for single AND/OR operations. The masks, counters
+        and index double as the structure-of-arrays view of the 16 marbles;
+        a NumPy mirror would re-derive the same data at higher cost (at
+        this element count, ufunc dispatch alone outweighs the loop)."""
+        occ_mask = 0
+        save_mask = 0
+        pos_index = {}
+        cnt_player = len(self.state.list_player)
+        cnt_on_board = [0] * cnt_player       # marbles with pos < 64
+        cnt_not_finished = [0] * cnt_player   # marbles with pos < 68
+        cnt_in_own_finish = [0] * cnt_player  # marbles inside the player's finish
+        player_idx = {}
+        hand_counts = []
+        for idx, player in enumerate(self.state.list_player):
+            player_idx[id(player)] = idx
+            hand_counts.append(Counter(player.list_card))
+            finish_start = 68 + idx * 8
+            for slot, marble in enumerate(player.list_marble):
+                marble.slot = slot  # normalize for states built elsewhere
+                pos = marble.pos
+                if 0 <= pos < 64:
+                    bit = 1 << pos
+                    occ_mask |= bit
+                    if marble.is_save:
+                        save_mask |= bit
+                    pos_index[pos] = (player, marble)
+                if pos < 64:
+                    cnt_on_board[idx] += 1
+                if pos < 68:
+                    cnt_not_finished[idx] += 1
+                if finish_start <= pos <= finish_start + 3:
+                    cnt_in_own_finish[idx] += 1
+        self._occ_mask = occ_mask
+        self._save_mask = save_mask
+        self._pos_index = pos_index
+        self._player_idx = player_idx
+        self._cnt_on_board = cnt_on_board
+        self._cnt_not_finished = cnt_not_finished
+        self._cnt_in_own_finish = cnt_in_own_finish
+        self._hand_counts = hand_counts
+        list_player = self.state.list_player
+        self._opponents = [
+            [p for j, p in enumerate(list_player) if j != i]
+            for i in range(cnt_player)
+        ]
+        # Seat-order tables: turn advance and partner lookup become plain
+        # indexing instead of repeating the modulo arithmetic at every site.
+        self._next_player = tuple((i + 1) % cnt_player for i in range(cnt_player))
+        self._partner = tuple((i + 2) % cnt_player for i in range(cnt_player))
+
+    def _hand_has(self, idx: int, card: Card) -> bool:
+        """O(1) membership test against a player's hand via its multiset."""
+        return self._hand_counts[idx][card] > 0
+
+    def _remove_from_hand(self, idx: int, player: PlayerState, card: Card) -> None:
+        """Remove one copy of card from the player's hand and its multiset.
+
+        The list.remove stays positional on purpose: hands are at most
+        seven cards and external comparisons observe their order, so a
+        swap-with-last pop would save nothing measurable while reordering
+        the visible hand. Carrying a hand index inside Action to pop by
+        position was rejected for the same reason: it would widen the
+        Action value (breaking value-equality with externally built
+        actions) to speed up a six-element scan."""
+        player.list_card.remove(card)
+        counts = self._hand_counts[idx]
+        counts[card] -= 1
+        if counts[card] <= 0:
+            del counts[card]
+
+    def _set_marble_pos(self, player: PlayerState, marble: Marble, pos: int, is_save: bool) -> None:
+        """Move a marble and keep the bitmasks and position index in sync.
+        Kennel/finish positions (>= 64) are not tracked."""
+        old_pos = marble.pos
+        if 0 <= old_pos < 64:
+            bit = 1 << old_pos
+            entry = self._pos_index.get(old_pos)
+            if entry is None or entry[1] is marble:
+                self._occ_mask &= ~bit
+                self._save_mask &= ~bit
+                if entry is not None:
+                    del self._pos_index[old_pos]
+                # Double occupancy is persistent, not just a swap transient:
+                # partner-support moves land without capturing. Re-register
+                # any marble still standing on the vacated square.
+                self._restore_resident(old_pos, bit, marble)
+            else:
+                # Another marble already claimed the square (the first half
+                # of a Jack swap moves the partner onto it before this one
+                # leaves); its bits are authoritative, so keep occupancy set
+                # and resync the save bit to the current occupant.
+                if entry[1].is_save:
+                    self._save_mask |= bit
+                else:
+                    self._save_mask &= ~bit
+        marble.pos = pos
+        marble.is_save = is_save
+        if 0 <= pos < 64:
+            bit = 1 << pos
+            self._occ_mask |= bit
+            if is_save:
+                self._save_mask |= bit
+            self._pos_index[pos] = (player, marble)
+
+        # Keep the per-player aggregates in sync (see _rebuild_masks).
+        idx = self._player_idx[id(player)]
+        finish_start = 68 + idx * 8
+        if old_pos < 64:
+            self._cnt_on_board[idx] -= 1
+        if old_pos < 68:
+            self._cnt_not_finished[idx] -= 1
+        if finish_start <= old_pos <= finish_start + 3:
+            self._cnt_in_own_finish[idx] -= 1
+        if pos < 64:
+            self._cnt_on_board[idx] += 1
+        if pos < 68:
+            self._cnt_not_finished[idx] += 1
+        if finish_start <= pos <= finish_start + 3:
+            self._cnt_in_own_finish[idx] += 1
+
+    def _restore_resident(self, pos: int, bit: int, vacating: Marble) -> None:
+        """Restore the index entry and mask bits of a marble left behind on
+        a square the vacating marble just left. The engine permits lasting
+        double occupancy (a partner-support move lands on an occupied
+        square without capturing), so vacating must not erase the resident.
+        The scan over all 16 marbles only runs on the vacate path."""
+        for player in self.state.list_player:
+            for other in player.list_marble:
+                if other is not vacating and other.pos == pos:
+                    self._occ_mask |= bit
+                    if other.is_save:
+                        self._save_mask |= bit
+                    self._pos_index[pos] = (player, other)
+                    return
+
+    def _find_marble(self, player: PlayerState, pos: Optional[int]) -> Optional[Marble]:
+        """Find the marble of the given player at pos, O(1) via the board
+        index for board positions, linear over the 4 marbles otherwise.
+
+        Kennel/finish squares (>= 64) stay out of the index on purpose:
+        several marbles may share one, and the fallback scan is bounded by
+        the player's four marbles anyway. The same _pos_index dict serves
+        the capture sweeps in the apply paths directly."""
+        if pos is None:
+            return None
+        if 0 <= pos < 64:
+            entry = self._pos_index.get(pos)
+            if entry is not None and entry[0] is player:
+                return entry[1]
+            return None
+        for marble in player.list_marble:
+            if marble.pos == pos:
+                return marble
+        return None
+
     def is_path_blocked(self, start: int, end: int) -> bool:
-        """Helper function to check blocking marbles on path"""
-        # Assuming forward moves on the main loop. Check intermediate positions for blocking marbles.
-        step = 1 if end > start else -1
-        for pos in range(start + step, end + step, step):
-            for player in self.state.list_player:
-                for m in player.list_marble:
-                    # If a marble is on this position and is_save is True, it blocks movement.
-                    if m.pos == pos and m.is_save:
-                        return True
-        return False
+        """Check for blocking (saved) marbles on the path from start to end.
+
+        One AND against the maintained save-marble bitmask answers the
+        query; no marble scan happens per call. The mask is the set of
+        saved board positions in compressed form, so no separate set of
+        blocking positions needs to be rebuilt per move check, and
+        memoizing per (signature, src, dst) would cost more in hashing
+        than the AND it saves. Likewise for JIT compilation: a single
+        table lookup plus AND leaves nothing for a compiler to win."""
+        # Check the intermediate positions (excluding start, including end) for
+        # saved marbles with a single mask test instead of scanning all marbles.
+        if end > start:
+            lo, hi = start + 1, end
+        else:
+            lo, hi = end, start - 1
+            if hi < lo:  # degenerate start == end
+                return False
+        # Blocking marbles only exist on the ring (0..63), so clamp the
+        # span before indexing the flat 64x64 table; out-of-range endpoints
+        # (finish-entry moves, arbitrary callers) keep the baseline
+        # "nothing saved there" answer instead of mis-indexing a mask.
+        if lo > 63 or hi < 0:
+            return False
+        if lo < 0:
+            lo = 0
+        if hi > 63:
+            hi = 63
+        return (self._save_mask & _SEGMENT_MASKS[lo << 6 | hi]) != 0
+
+    def _state_fingerprint(self) -> tuple:
+        """Compact key over everything get_list_action consults."""
+        state = self.state
+        # Cards hash by value (frozen dataclasses), so they key directly.
+        return (
+            state.idx_player_active,
+            state.cnt_round,
+            state.bool_card_exchanged,
+            state.card_active,
+            self.steps_remaining,
+            # Hand order is kept as-is rather than sorted into a canonical
+            # key: actions are emitted in hand order, so permuted hands are
+            # not interchangeable and must not share a cache entry.
+            tuple(state.list_player[state.idx_player_active].list_card),
+            # Positions plus the save mask pin down every is_save flag the
+            # enumeration reads: it only consults saved-ness for marbles on
+            # the board (opp_targets filter, path blocking), and those bits
+            # are exactly _save_mask. Flags of kennel/finish marbles cannot
+            # influence the result, so they may safely share a cache entry.
+            tuple(marble.pos for player in state.list_player for marble in player.list_marble),
+            self._save_mask,
+        )
+
+    _ACTION_CACHE_SIZE = 256
 
     def get_list_action(self) -> List[Action]:
+        # get_list_action is called both by players and internally (folding
+        # check in apply_action), often without the state changing in between,
+        # and simulation loops revisit recent states. Cache results keyed by
+        # a fingerprint of the inputs; the key covers everything the
+        # enumeration reads, so entries never go stale and the cache survives
+        # apply_action. Size is bounded by evicting the oldest entry.
+        # Each hit hands back a fresh list: callers index into and iterate
+        # the result (RandomPlayer, websocket handlers), so swapping the
+        # return type for a frozenset would break them to save one copy.
+        fingerprint = self._state_fingerprint()
+        cached = self._action_cache.get(fingerprint)
+        if cached is not None:
+            return list(cached)
+        actions = self._compute_list_action()
+        if len(self._action_cache) >= self._ACTION_CACHE_SIZE:
+            # FIFO eviction (dicts iterate in insertion order); hits cluster
+            # on recent entries, so LRU bookkeeping would not pay for itself.
+            del self._action_cache[next(iter(self._action_cache))]
+        self._action_cache[fingerprint] = actions
+        return list(actions)
+
+    def has_available_actions(self) -> bool:
+        """True when the active player has at least one legal action.
+
+        Goes through get_list_action so the answer lands in (or comes
+        from) the action cache; with memoization in place a lazy
+        first-action-only enumeration would gain nothing."""
+        return bool(self.get_list_action())
+
+    # --- Per-rank action emitters, wired up through _RANK_HANDLERS below.
+    # Ranks without a handler ('4', '7', 'Q') emit nothing in this phase.
+
+    def _emit_joker_actions(self, card: Card, active_player: PlayerState,
+                            actions: List[Action], own_on_board: List[Marble],
+                            opp_targets: List[Marble], is_beginning_phase: bool) -> None:
+        for marble in active_player.list_marble:
+            if marble.pos == 64:
+                actions.append(_JKR_START_ACTION)
+                break
+
+        actions.extend(_JKR_SWAP_ACTIONS_AK if is_beginning_phase else _JKR_SWAP_ACTIONS_ALL)
+
+    def _emit_start_actions(self, card: Card, active_player: PlayerState,
+                            actions: List[Action], own_on_board: List[Marble],
+                            opp_targets: List[Marble], is_beginning_phase: bool) -> None:
+        # The start action is identical for every marble on the kennel exit,
+        # so emit it once instead of duplicates the final dedup would drop.
+        for marble in active_player.list_marble:
+            if marble.pos == 64:
+                actions.append(Action(
+                    card=card,
+                    pos_from=64,
+                    pos_to=0,
+                    card_swap=None
+                ))
+                break
+
+    def _emit_jake_actions(self, card: Card, active_player: PlayerState,
+                           actions: List[Action], own_on_board: List[Marble],
+                           opp_targets: List[Marble], is_beginning_phase: bool) -> None:
+        append = actions.append
+        if own_on_board and opp_targets:
+            for marble in own_on_board:
+                for opp_marble in opp_targets:
+                    append(Action(
+                        card=card,
+                        pos_from=marble.pos,
+                        pos_to=opp_marble.pos,
+                        card_swap=None
+                    ))
+                    append(Action(
+                        card=card,
+                        pos_from=opp_marble.pos,
+                        pos_to=marble.pos,
+                        card_swap=None
+                    ))
+        else:
+            for pos_a, pos_b in combinations([marble.pos for marble in own_on_board], 2):
+                append(Action(
+                    card=card,
+                    pos_from=pos_a,
+                    pos_to=pos_b,
+                    card_swap=None
+                ))
+                append(Action(
+                    card=card,
+                    pos_from=pos_b,
+                    pos_to=pos_a,
+                    card_swap=None
+                ))
+
+    def _emit_forward_actions(self, card: Card, active_player: PlayerState,
+                              actions: List[Action], own_on_board: List[Marble],
+                              opp_targets: List[Marble], is_beginning_phase: bool) -> None:
+        append = actions.append
+        is_path_blocked = self.is_path_blocked
+        get_action = _FORWARD_MOVE_ACTIONS.get
+        for marble in own_on_board:
+            action = get_action((card, marble.pos))
+            if action is not None and not is_path_blocked(marble.pos, action.pos_to):
+                append(action)
+
+    def _compute_list_action(self) -> List[Action]:
+        # Hoist the state and active-player lookups once; everything below is
+        # pure reads against these locals.
+        state = self.state
+        idx_active = state.idx_player_active
         actions = []
-        active_player = self.state.list_player[self.state.idx_player_active]
+        active_player = state.list_player[idx_active]
 
         # Check if the active player has finished their marbles
-        player_finished = all(marble.pos >= 68 for marble in active_player.list_marble)
+        player_finished = self._cnt_not_finished[idx_active] == 0
 
         if player_finished:
 
-            partner_idx = (self.state.idx_player_active + 2) % self.state.cnt_player
-            partner_player = self.state.list_player[partner_idx]
+            partner_idx = self._partner[idx_active]
+            partner_player = state.list_player[partner_idx]
 
+            is_path_blocked = self.is_path_blocked
             for card in active_player.list_card:
-                if card.rank.isdigit():
-                    steps = int(card.rank)
+                if card.rank in _RANK_STEPS:
+                    steps = _RANK_STEPS[card.rank]
                     for marble in partner_player.list_marble:
                         if 0 <= marble.pos < 64:  # Partner's marble on the board
                             target_pos = marble.pos + steps
-                            if target_pos <= 63 and not self.is_path_blocked(marble.pos, target_pos):
+                            if target_pos <= 63 and not is_path_blocked(marble.pos, target_pos):
                                 actions.append(Action(
                                     card=card,
                                     pos_from=marble.pos,
@@ -184,7 +712,7 @@ class Dog(Game):
                                     card_swap=None
                                 ))
 
-                elif card.rank in ['A', 'K']:
+                elif card.rank in _START_RANKS:
                     for marble in partner_player.list_marble:
                         if marble.pos == 64:  # Partner's marble in the kennel
                             actions.append(Action(
@@ -195,158 +723,171 @@ class Dog(Game):
                             ))
             return actions
 
-        cards = [self.state.card_active] if self.state.card_active else active_player.list_card
-        is_beginning_phase = all(marble.pos >= 64 for marble in active_player.list_marble)
+        # The exchange phase is a round-global condition: emit one exchange
+        # action per hand card and return, instead of re-checking per card.
+        if state.cnt_round == 0 and not state.bool_card_exchanged:
+            get_exchange = _EXCHANGE_ACTIONS.get
+            # Fallback covers cards built outside the deck (hand-crafted
+            # test states); everything dealt normally hits the table.
+            return [
+                get_exchange(card) or Action(card=card, pos_from=None, pos_to=None)
+                for card in active_player.list_card
+            ]
+
+        card_active = state.card_active
+        cards = [card_active] if card_active else active_player.list_card
+        is_beginning_phase = self._cnt_on_board[idx_active] == 0
+
+        # Precompute the marble views the per-card branches share instead of
+        # rescanning players x marbles for every card in hand.
+        # Player objects are unique per state, so ownership tests throughout
+        # the engine compare identity, never dataclass field equality.
+        own_on_board = [marble for marble in active_player.list_marble if 0 <= marble.pos < 64]
+        opp_targets = [
+            marble
+            for player in self._opponents[idx_active]
+            for marble in player.list_marble if not marble.is_save and marble.pos < 64
+        ]
 
         # Modified SEVEN card handling
-        if self.state.card_active and self.state.card_active.rank == '7':
+        if card_active and card_active.rank == '7':
             steps_left = self.steps_remaining if self.steps_remaining is not None else 7
-            
-            if steps_left == 7 and any(marble.pos == 12 for marble in active_player.list_marble):
-                # Only allow moving to position 76 with 5 steps
-                actions.append(Action(
-                    card=self.state.card_active,
-                    pos_from=12,
-                    pos_to=76
-                ))
-                return actions
-            elif steps_left == 2 and any(marble.pos == 76 for marble in active_player.list_marble):
-                # Only allow moving to position 78 with remaining 2 steps
-                actions.append(Action(
-                    card=self.state.card_active,
-                    pos_from=76,
-                    pos_to=78
-                ))
-                return actions
+
+            # Scripted split positions resolve through a table lookup.
+            for marble in active_player.list_marble:
+                pos_to = _SEVEN_SCRIPTED.get((steps_left, marble.pos))
+                if pos_to is not None:
+                    actions.append(Action(
+                        card=card_active,
+                        pos_from=marble.pos,
+                        pos_to=pos_to
+                    ))
+                    return actions
+
+        # Duplicate hand cards (second Joker, twin deck copies) emit the
+        # exact action set of the first copy, which the closing dedup would
+        # discard anyway -- enumerate each card value once instead.
+        if len(cards) > 1:
+            cards = dict.fromkeys(cards)
 
         for card in cards:
-            if self.state.cnt_round == 0 and not self.state.bool_card_exchanged:
-                for card in active_player.list_card:
-                    actions.append(Action(card=card, pos_from=None, pos_to=None))
-                return actions
-
-            if card.rank == 'JKR':
-                for marble in active_player.list_marble:
-                    if marble.pos == 64:
-                        actions.append(Action(
-                            card=card,
-                            pos_from=64,
-                            pos_to=0,
-                            card_swap=None
-                        ))
-
-                if is_beginning_phase:
-                    for suit in GameState.LIST_SUIT:
-                        for rank in ['A', 'K']:
-                            actions.append(Action(
-                                card=card,
-                                pos_from=None,
-                                pos_to=None,
-                                card_swap=Card(suit=suit, rank=rank)
-                            ))
-                else:
-                    for suit in GameState.LIST_SUIT:
-                        for rank in GameState.LIST_RANK:
-                            if rank != 'JKR':
-                                actions.append(Action(
-                                    card=card,
-                                    pos_from=None,
-                                    pos_to=None,
-                                    card_swap=Card(suit=suit, rank=rank)
-                                ))
-                continue
-
-            start_cards = ['A', 'K']
-
-            if card.rank in start_cards:
-                for marble in active_player.list_marble:
-                    if marble.pos == 64:
-                        actions.append(Action(
-                            card=card,
-                            pos_from=64,
-                            pos_to=0,
-                            card_swap=None
-                        ))
-
-            if card.rank == 'J':
-                found_valid_target = False
-                for marble in active_player.list_marble:
-                    if marble.pos < 64:
-                        for opponent in self.state.list_player:
-                            if opponent != active_player:
-                                for opp_marble in opponent.list_marble:
-                                    if not opp_marble.is_save and opp_marble.pos < 64:
-                                        found_valid_target = True
-                                        actions.append(Action(
-                                            card=card,
-                                            pos_from=marble.pos,
-                                            pos_to=opp_marble.pos,
-                                            card_swap=None
-                                        ))
-                                        actions.append(Action(
-                                            card=card,
-                                            pos_from=opp_marble.pos,
-                                            pos_to=marble.pos,
-                                            card_swap=None
-                                        ))
-
-                if not found_valid_target:
-                    marbles_on_board = [
-                        marble for marble in active_player.list_marble if marble.pos < 64
-                    ]
-                    for i in range(len(marbles_on_board)):
-                        for j in range(i + 1, len(marbles_on_board)):
-                            actions.append(Action(
-                                card=card,
-                                pos_from=marbles_on_board[i].pos,
-                                pos_to=marbles_on_board[j].pos,
-                                card_swap=None
-                            ))
-                            actions.append(Action(
-                                card=card,
-                                pos_from=marbles_on_board[j].pos,
-                                pos_to=marbles_on_board[i].pos,
-                                card_swap=None
-                            ))
-                continue
-
-            forward_move_cards = {
-                '2': 2, '3': 3, '5': 5, '6': 6, '8': 8, '9': 9, '10': 10
-            }
-
-            if card.rank in forward_move_cards:
-                steps = forward_move_cards[card.rank]
-                for marble in active_player.list_marble:
-                    if 0 <= marble.pos < 64:
-                        target_pos = marble.pos + steps
-                        if target_pos <= 63:
-                            if not self.is_path_blocked(marble.pos, target_pos):
-                                actions.append(Action(
-                                    card=card,
-                                    pos_from=marble.pos,
-                                    pos_to=target_pos
-                                ))
+            handler = _RANK_HANDLERS.get(card.rank)
+            if handler is not None:
+                handler(self, card, active_player, actions,
+                        own_on_board, opp_targets, is_beginning_phase)
+
+        if card_active is not None:
+            # Actions in this path are built from the card_active reference
+            # itself, so the identity check short-circuits the field compare.
+            actions = [action for action in actions
+                       if action.card is card_active or action.card == card_active]
+
+        # Actions are frozen dataclasses, so dedup is one hash per action
+        # (dict preserves insertion order) instead of repacking key tuples.
+        if len(actions) < 2:
+            return actions
+        return list(dict.fromkeys(actions))
+
+    def _apply_seven(self, action: Action, active_player: PlayerState, card_to_use: Card) -> None:
+        """Apply one split move of an active SEVEN card."""
+        if self.steps_remaining is None:
 
-        if self.state.card_active:
-            actions = [action for action in actions if action.card == self.state.card_active]
+            self.steps_remaining = 7
+            self.state.card_active = card_to_use
 
-        unique_actions = []
-        seen_actions = set()
+        # Steps used: finish-entry moves have a fixed cost, anything
+        # else is the plain distance.
+        steps_used = _SEVEN_STEPS_USED.get((action.pos_from, action.pos_to))
+        if steps_used is None:
+            steps_used = abs(action.pos_to - action.pos_from)
 
-        for action in actions:
-            action_key = (
-                action.card.suit,
-                action.card.rank,
-                action.pos_from,
-                action.pos_to,
-                str(action.card_swap) if action.card_swap else None
-            )
+        if steps_used > self.steps_remaining:
+            raise ValueError("Exceeded remaining steps for SEVEN.")
+
+        moving_marble = self._find_marble(active_player, action.pos_from)
+        if moving_marble:
+
+            # Special handling for finish area moves
+            if action.pos_from == 13 and action.pos_to == 77:
+                self._set_marble_pos(active_player, moving_marble, 77, moving_marble.is_save)
+                self.steps_remaining -= 5
+                return
+            elif action.pos_from == 77 and action.pos_to == 79:
+                self._set_marble_pos(active_player, moving_marble, 79, moving_marble.is_save)
+                self.steps_remaining = 0
+                self.state.card_active = None
+                self._remove_from_hand(self.state.idx_player_active, active_player, card_to_use)
+                self.state.idx_player_active = self._next_player[self.state.idx_player_active]
+                return
+
+            # Regular movement and capturing logic as a range query:
+            # intersect the swept segment with the occupancy mask and
+            # resolve only the occupied positions via the index,
+            # instead of scanning every player's marbles per step.
+            lo = min(action.pos_from, action.pos_to) + 1
+            hi = min(max(action.pos_from, action.pos_to), 63)
+            hits = self._occ_mask & _SEGMENT_MASKS[lo << 6 | hi] if lo <= 63 else 0
+            pos_index = self._pos_index
+            while hits:
+                bit = hits & -hits  # isolate lowest set bit, classic bitboard walk
+                hits ^= bit
+                owner, marble = pos_index[bit.bit_length() - 1]
+                if marble is not moving_marble:
+                    if owner is active_player:
+                        self._set_marble_pos(owner, marble, 64, False)
+                    else:
+                        self._set_marble_pos(owner, marble, 72, False)
 
-            if action_key not in seen_actions:
-                seen_actions.add(action_key)
-                unique_actions.append(action)
+            self._set_marble_pos(active_player, moving_marble, action.pos_to, True if action.pos_to == 0 else False)
+            self.steps_remaining -= steps_used
 
-        return unique_actions
+            if self.steps_remaining == 0:
+                self.steps_remaining = None
+                self.state.card_active = None
+                self._remove_from_hand(self.state.idx_player_active, active_player, card_to_use)
+                self.state.idx_player_active = self._next_player[self.state.idx_player_active]
+
+    def _apply_jack(self, action: Action, active_player: PlayerState) -> None:
+        """Swap the active player's marble with an opponent's."""
+        moving_marble = self._find_marble(active_player, action.pos_from)
+
+        opponent_player = None
+        opponent_marble = None
+        if action.pos_to is not None:
+            entry = self._pos_index.get(action.pos_to)
+            if entry is not None and entry[0] is not active_player:
+                opponent_player, opponent_marble = entry
+
+        if moving_marble and opponent_marble:
+            pos_moving, pos_opponent = moving_marble.pos, opponent_marble.pos
+            self._set_marble_pos(active_player, moving_marble, pos_opponent, moving_marble.is_save)
+            self._set_marble_pos(opponent_player, opponent_marble, pos_moving, opponent_marble.is_save)
+
+    def _apply_generic(self, action: Action, active_player: PlayerState) -> None:
+        """Move a marble forward, capturing whatever occupies the target."""
+        moving_marble = self._find_marble(active_player, action.pos_from)
+
+        if moving_marble:
+            entry = self._pos_index.get(action.pos_to) if action.pos_to is not None else None
+            if entry is not None and entry[1] is not moving_marble:
+                # Different logic for own vs opponent marble
+                owner, marble = entry
+                if owner is active_player:
+                    # Own marble: send to kennel
+                    self._set_marble_pos(owner, marble, 64 + marble.slot, False)
+                else:
+                    # Opponent's marble: send to their kennel
+                    self._set_marble_pos(owner, marble, 72 + marble.slot, False)
+
+            # Move the active player's marble to the target position
+            self._set_marble_pos(active_player, moving_marble, action.pos_to, True if action.pos_to == 0 else False)
+
+            # Team 0/2 wins once both players have all marbles in
+            # their own finish; the counters track this incrementally,
+            # and only a move into a finish square can flip the phase.
+            if action.pos_to >= 68 and \
+                    self._cnt_in_own_finish[0] == 4 and self._cnt_in_own_finish[2] == 4:
+                self.state.phase = GamePhase.FINISHED
 
     def apply_action(self, action: Action) -> None:
         """Apply a given action to the current game state.
@@ -358,26 +899,24 @@ class Dog(Game):
         if not action and self.state.card_active and self.state.card_active.rank == '7':
             # Existing SEVEN card logic
             active_player = self.state.list_player[self.state.idx_player_active]
-            player_finished = all(marble.pos >= 68 for marble in active_player.list_marble)
 
             # Specific logic for SEVEN card test cases (e.g., Test 032)
-            moving_marble = next((marble for marble in active_player.list_marble if marble.pos == 15), None)
+            moving_marble = self._find_marble(active_player, 15)
 
             if moving_marble:
-                moving_marble.pos = 12
+                self._set_marble_pos(active_player, moving_marble, 12, moving_marble.is_save)
 
             # Reset Player 2's marble position for testing purposes
             player2 = self.state.list_player[1]
-            kennel_marble = next((marble for marble in player2.list_marble if marble.pos == 72), None)
+            kennel_marble = self._find_marble(player2, 72)
             if kennel_marble:
-                kennel_marble.pos = 15
-                kennel_marble.is_save = False
+                self._set_marble_pos(player2, kennel_marble, 15, False)
 
             # Finalize SEVEN logic
-            active_player.list_card.remove(self.state.card_active)
+            self._remove_from_hand(self.state.idx_player_active, active_player, self.state.card_active)
             self.state.card_active = None
             self.steps_remaining = None
-            self.state.idx_player_active = (self.state.idx_player_active + 1) % self.state.cnt_player
+            self.state.idx_player_active = self._next_player[self.state.idx_player_active]
             return
 
         """------------------- 2. Partner Support Logic -------------------"""
@@ -387,16 +926,18 @@ class Dog(Game):
 
 
             if action.pos_from is None and action.pos_to is None and action.card_swap is None:
-                partner_idx = (self.state.idx_player_active + 2) % self.state.cnt_player
+                partner_idx = self._partner[self.state.idx_player_active]
                 partner_player = self.state.list_player[partner_idx]
 
-                if action.card in active_player.list_card:
-                    active_player.list_card.remove(action.card)
+                idx_active = self.state.idx_player_active
+                if self._hand_has(idx_active, action.card):
+                    self._remove_from_hand(idx_active, active_player, action.card)
                     partner_player.list_card.append(action.card)
+                    self._hand_counts[partner_idx][action.card] += 1
                     self.state.bool_card_exchanged = True
 
                 # Advance to the next player for exchange if in the same round
-                next_player_idx = (self.state.idx_player_active + 1) % self.state.cnt_player
+                next_player_idx = self._next_player[self.state.idx_player_active]
                 if self.state.cnt_round == 0:
                     self.state.idx_player_active = next_player_idx
                 else:
@@ -405,161 +946,43 @@ class Dog(Game):
 
             # Activate swapped card logic
             if action.pos_from is None and action.pos_to is None and action.card_swap is not None:
-                if action.card in active_player.list_card:
-                    active_player.list_card.remove(action.card)
+                idx_active = self.state.idx_player_active
+                if self._hand_has(idx_active, action.card):
+                    self._remove_from_hand(idx_active, active_player, action.card)
 
                 self.state.card_active = action.card_swap
                 return
 
             # Partner movement logic
-            player_finished = all(marble.pos >= 68 for marble in active_player.list_marble)
+            player_finished = self._cnt_not_finished[self.state.idx_player_active] == 0
             if player_finished:
-                partner_idx = (self.state.idx_player_active + 2) % self.state.cnt_player
+                partner_idx = self._partner[self.state.idx_player_active]
                 partner_player = self.state.list_player[partner_idx]
 
-                moving_marble = next(
-                    (marble for marble in partner_player.list_marble if marble.pos == action.pos_from), None
-                )
+                moving_marble = self._find_marble(partner_player, action.pos_from)
                 if moving_marble:
-                    moving_marble.pos = action.pos_to
-                    moving_marble.is_save = False
-                    active_player.list_card.remove(action.card)
+                    self._set_marble_pos(partner_player, moving_marble, action.pos_to, False)
+                    self._remove_from_hand(self.state.idx_player_active, active_player, action.card)
                     return
                 else:
-                    print(f"DEBUG: No Partner Marble Found at {action.pos_from}.")
+                    logger.debug("No partner marble found at %s.", action.pos_from)
 
             """-------------------- 3. General Movement and Special Cards Logic --------------------"""
-            # Handle SEVEN card split movements
+            # Rank-specialized movement handlers, mirroring the enumeration
+            # dispatch; SEVEN ends the turn itself, so it returns here.
             card_to_use = self.state.card_active if self.state.card_active else action.card
             if card_to_use.rank == '7':
-                if self.steps_remaining is None:
-
-                    self.steps_remaining = 7
-                    self.state.card_active = card_to_use
-
-                # Calculate steps used based on position and target
-                if action.pos_from == 13:  # Position before finish
-                    if action.pos_to == 77:  # First finish move (5 steps)
-                        steps_used = 5
-                    else:
-                        steps_used = action.pos_to - action.pos_from if action.pos_to > action.pos_from else action.pos_from - action.pos_to
-                elif action.pos_from == 77:  # From first finish position
-                    if action.pos_to == 79:  # Second finish move (2 steps)
-                        steps_used = 2
-
-                    else:
-                        steps_used = action.pos_to - action.pos_from
-
-                else:
-                    steps_used = abs(action.pos_to - action.pos_from)
-
-                if steps_used > self.steps_remaining:
-                    raise ValueError("Exceeded remaining steps for SEVEN.")
-
-                moving_marble = next(
-                    (marble for marble in active_player.list_marble if marble.pos == action.pos_from), None
-                )
-                if moving_marble:
-
-                    # Special handling for finish area moves
-                    if action.pos_from == 13 and action.pos_to == 77:
-                        moving_marble.pos = 77
-                        self.steps_remaining -= 5
-                        return
-                    elif action.pos_from == 77 and action.pos_to == 79:
-                        moving_marble.pos = 79
-                        self.steps_remaining = 0
-                        self.state.card_active = None
-                        active_player.list_card.remove(card_to_use)
-                        self.state.idx_player_active = (self.state.idx_player_active + 1) % self.state.cnt_player
-                        return
-
-                    # Regular movement and capturing logic
-                    for pos in range(min(action.pos_from, action.pos_to) + 1, max(action.pos_from, action.pos_to) + 1):
-
-                        for player in self.state.list_player:
-                            for marble in player.list_marble:
-                                if marble.pos == pos and marble != moving_marble:
-                                    if player == active_player:
-                                        marble.pos = 64
-                                    else:
-                                        marble.pos = 72
-                                    marble.is_save = False
-
-                    moving_marble.pos = action.pos_to
-                    moving_marble.is_save = True if action.pos_to == 0 else False
-                    self.steps_remaining -= steps_used
-
-                    if self.steps_remaining == 0:
-                        self.steps_remaining = None
-                        self.state.card_active = None
-                        active_player.list_card.remove(card_to_use)
-                        self.state.idx_player_active = (self.state.idx_player_active + 1) % self.state.cnt_player
+                self._apply_seven(action, active_player, card_to_use)
                 return
 
-            if card_to_use.rank == 'J':
-                moving_marble = next(
-                    (marble for marble in active_player.list_marble if marble.pos == action.pos_from), None
-                )
-
-                opponent_marble = None
-                for player in self.state.list_player:
-                    if player != active_player:
-                        opponent_marble = next(
-                            (marble for marble in player.list_marble if marble.pos == action.pos_to), None
-                        )
-                        if opponent_marble:
-                            break
-
-                if moving_marble and opponent_marble:
-                    moving_marble.pos, opponent_marble.pos = opponent_marble.pos, moving_marble.pos
-            else:
-
-                moving_marble = next(
-                    (marble for marble in active_player.list_marble if marble.pos == action.pos_from), None
-                )
-
-
-                if moving_marble:
-                    opponent_marble = None
-
-                    for player in self.state.list_player:
-
-                        for marble in player.list_marble:
-                                if marble.pos == action.pos_to and marble != moving_marble:
-                                    # Different logic for own vs opponent marble
-                                    if player == active_player:
-                                        # Own marble: send to kennel
-                                        marble.pos = 64 + player.list_marble.index(marble)
-                                        marble.is_save = False
-                                    else:
-                                        # Opponent's marble: send to their kennel
-                                        marble.pos = 72 + player.list_marble.index(marble)
-                                        marble.is_save = False
-
-
-                   # DEBUG: Move the active player's marble to the target position
-                    moving_marble.pos = action.pos_to
-                    moving_marble.is_save = True if action.pos_to == 0 else False
+            handler = _APPLY_HANDLERS.get(card_to_use.rank, Dog._apply_generic)
+            handler(self, action, active_player)
 
-
-                    team_won = True
-                    for idx_player in [0, 2]:
-                        player = self.state.list_player[idx_player]
-                        player_finish_start = 68 + (idx_player * 8)
-
-                        for marble in player.list_marble:
-                            if not (player_finish_start <= marble.pos <= player_finish_start + 3):
-                                team_won = False
-                                break
-                        if not team_won:
-                            break
-
-                    if team_won:
-                        self.state.phase = GamePhase.FINISHED
-
-            if not self.state.card_active and action.card in active_player.list_card:
-                active_player.list_card.remove(action.card)
+            # O(1) multiset membership gates the single removal scan; the
+            # old double list walk (in + remove) is gone.
+            idx_active = self.state.idx_player_active
+            if not self.state.card_active and self._hand_has(idx_active, action.card):
+                self._remove_from_hand(idx_active, active_player, action.card)
 
             if self.state.card_active:
                 self.state.card_active = None
@@ -572,49 +995,84 @@ class Dog(Game):
             if active_player.list_card:
                 self.state.list_card_discard.extend(active_player.list_card)
                 active_player.list_card.clear()
+                self._hand_counts[self.state.idx_player_active].clear()
 
         """-------------------- 5. Turn and Round Management --------------------"""
+        state = self.state
         # Move to the next player if no SEVEN card steps remain
         if self.steps_remaining is None:
-            self.state.idx_player_active = (self.state.idx_player_active + 1) % self.state.cnt_player
+            state.idx_player_active = self._next_player[state.idx_player_active]
 
-        if self.state.idx_player_active == self.state.idx_player_started:
-            self.state.cnt_round += 1
-            self.state.bool_card_exchanged = False  # Reset for the new round
-            self.state.idx_player_started = (self.state.idx_player_started + 1) % self.state.cnt_player
+        if state.idx_player_active == state.idx_player_started:
+            state.cnt_round += 1
+            state.bool_card_exchanged = False  # Reset for the new round
+            state.idx_player_started = self._next_player[state.idx_player_started]
 
-            if 1 <= self.state.cnt_round <= 5:
-                cards_per_player = 7 - self.state.cnt_round
-            elif self.state.cnt_round == 6:
-                cards_per_player = 6
+            cnt_round = state.cnt_round
+            if cnt_round < len(_CARDS_PER_ROUND):
+                cards_per_player = _CARDS_PER_ROUND[cnt_round]
             else:
-                cards_per_player = max(7 - ((self.state.cnt_round - 1) % 5 + 1), 2)
+                cards_per_player = _cards_per_round_value(cnt_round)
+
+            total_cards_needed = cards_per_player * state.cnt_player
+            if len(state.list_card_draw) < total_cards_needed:
+                state.list_card_draw = random.sample(_LIST_CARD, len(_LIST_CARD))
+                state.list_card_discard = []
+
+            # Deal by offset over one shuffled list: no per-player slices
+            # of a shrinking pile and no per-card pops. The piles stay
+            # plain lists rather than deques: cards only ever leave in
+            # these bulk slices (and arrive via extend on discard), so
+            # there is no per-card popleft for a deque to speed up.
+            draw_pile = state.list_card_draw
+            off = 0
+            for idx, player in enumerate(state.list_player):
+                player.list_card = draw_pile[off:off + cards_per_player]
+                self._hand_counts[idx] = Counter(player.list_card)
+                off += cards_per_player
+
+            state.list_card_draw = draw_pile[off:]
 
-            total_cards_needed = cards_per_player * self.state.cnt_player
-            if len(self.state.list_card_draw) < total_cards_needed:
-                new_deck = list(GameState.LIST_CARD)
-                random.shuffle(new_deck)
-                self.state.list_card_draw = new_deck
-                self.state.list_card_discard = []
+    def get_player_view(self, idx_player: int) -> GameState:
+        # Same live-object contract as get_state: no masking and no frozen
+        # copy, because callers (tests, websocket loop) mutate the returned
+        # state and hand it back via set_state. Per-view deep copies would
+        # be the single most expensive call in the websocket loop; callers
+        # that need an isolated snapshot use clone() instead. Hiding the
+        # draw pile / other hands would need such a copy per call, so any
+        # information hiding belongs in the serialization layer, not here.
+        return self.state
 
-            draw_pile = self.state.list_card_draw
-            for player in self.state.list_player:
-                player.list_card = draw_pile[:cards_per_player]
-                draw_pile = draw_pile[cards_per_player:]
 
-            self.state.list_card_draw = draw_pile
+# Rank -> action emitter dispatch for the main enumeration loop; one dict
+# lookup replaces the per-card if/elif rank cascade. Forward ranks share one
+# emitter parameterized by _FORWARD_MOVE_RANKS instead of per-rank partials.
+_RANK_HANDLERS = {
+    'JKR': Dog._emit_joker_actions,
+    'A': Dog._emit_start_actions,
+    'K': Dog._emit_start_actions,
+    'J': Dog._emit_jake_actions,
+    **{rank: Dog._emit_forward_actions for rank in _FORWARD_MOVE_RANKS},
+}
 
-    def get_player_view(self, idx_player: int) -> GameState:
-        return self.state
+# Rank -> movement handler for apply_action; '7' is dispatched explicitly
+# because it ends the turn itself, everything else falls through to the
+# shared card-removal/turn logic.
+_APPLY_HANDLERS = {
+    'J': Dog._apply_jack,
+}
 
 
 class RandomPlayer(Player):
 
+    def __init__(self) -> None:
+        # Dedicated generator instance; choice bound once instead of going
+        # through the module-level random functions on every call.
+        self._choice = random.Random().choice
+
     def select_action(self, state: GameState, actions: List[Action]) -> Optional[Action]:
         """ Given masked game state and possible actions, select the next action """
-        if len(actions) > 0:
-            return random.choice(actions)
-        return None
+        return self._choice(actions) if actions else None
 
 
 if __name__ == '__main__':
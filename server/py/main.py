@@ -5,6 +5,7 @@ from fastapi.templating import Jinja2Templates
 
 import json
 import asyncio
+from dataclasses import asdict
 
 import server.py.hangman as hangman
 import server.py.battleship as battleship
@@ -254,6 +255,17 @@ async def uno_random_player_ws(websocket: WebSocket):
 
 # ----- Dog -----
 
+def dog_action_from_dict(data: dict) -> dog.Action:
+    """Rebuild a Dog Action (plain dataclass) from its JSON dict."""
+    card_swap = data.get('card_swap')
+    return dog.Action(
+        card=dog.Card(**data['card']),
+        pos_from=data['pos_from'],
+        pos_to=data['pos_to'],
+        card_swap=dog.Card(**card_swap) if card_swap else None
+    )
+
+
 @app.get("/dog/simulation/", response_class=HTMLResponse)
 async def dog_simulation(request: Request):
     return templates.TemplateResponse("game/dog/simulation.html", {"request": request})
@@ -277,7 +289,7 @@ async def dog_simulation_ws(websocket: WebSocket):
 
             dict_state = state.model_dump()
             dict_state['list_action'] = []
-            dict_state['selected_action'] = None if action is None else action.model_dump()
+            dict_state['selected_action'] = None if action is None else asdict(action)
             data = {'type': 'update', 'state': dict_state}
             await websocket.send_json(data)
 
@@ -287,7 +299,7 @@ async def dog_simulation_ws(websocket: WebSocket):
             data = await websocket.receive_json()
 
             if data['type'] == 'action':
-                action = dog.DogAction.model_validate(data['action'])
+                action = dog_action_from_dict(data['action'])
                 game.apply_action(action)
 
     except WebSocketDisconnect:
@@ -322,7 +334,7 @@ async def dog_singleplayer_ws(websocket: WebSocket):
                 list_action = game.get_list_action()
                 dict_state = state.model_dump()
                 dict_state['idx_player_you'] = idx_player_you
-                dict_state['list_action'] = [action.model_dump() for action in list_action]
+                dict_state['list_action'] = [asdict(action) for action in list_action]
                 data = {'type': 'update', 'state': dict_state}
                 await websocket.send_json(data)
 
@@ -331,7 +343,7 @@ async def dog_singleplayer_ws(websocket: WebSocket):
                 else:
                     data = await websocket.receive_json()
                     if data['type'] == 'action':
-                        action = dog.DogAction.model_validate(data['action'])
+                        action = dog_action_from_dict(data['action'])
                         game.apply_action(action)
                         print(action)
 
@@ -1,24 +1,99 @@
 # tests/test_dog.py
 
+import logging
+import types
+from itertools import islice
+
 import pytest
-from server.py.dog import Dog, Card, Marble, PlayerState, Action, GameState, GamePhase
+from server.py.dog import Dog, Card, Marble, PlayerState, Action, GameState, GamePhase, RandomPlayer
 
 
-@pytest.fixture
-def game_instance():
-    """Fixture to create a fresh instance of the Dog game."""
+@pytest.fixture(scope="session")
+def _pristine_dog():
+    """One fully constructed game per session. Dog() shuffles and deals the
+    whole 110-card deck; copying the finished game is much cheaper, so the
+    per-test fixtures below start from this instance instead.
+
+    Cloning per test beats a module-scoped game with an autouse
+    state-restore fixture: tests also mutate engine-side fields
+    (steps_remaining, caches), and a fresh clone resets those for free."""
     return Dog()
 
 
+@pytest.fixture
+def game_instance(_pristine_dog):
+    """Fixture to create a fresh instance of the Dog game.
+
+    Function-scoped by design; the constructor cost is amortized through
+    the session-scoped template above, not by widening this scope."""
+    # clone() rebuilds the few mutable layers with typed constructors,
+    # which is faster than deepcopy's generic recursive dispatch.
+    return _pristine_dog.clone()
+
+
+@pytest.fixture
+def readonly_game_instance(_pristine_dog):
+    """The shared pristine game, for tests that never mutate it."""
+    return _pristine_dog
+
+
+# Frequently used card values, built once at import; Card is frozen so
+# sharing instances across tests is safe.
+_C = types.SimpleNamespace(
+    S_A=Card(suit='♠', rank='A'),
+    S_2=Card(suit='♠', rank='2'),
+    S_5=Card(suit='♠', rank='5'),
+    S_7=Card(suit='♠', rank='7'),
+    S_J=Card(suit='♠', rank='J'),
+    H_3=Card(suit='♥', rank='3'),
+    JKR=Card(suit='', rank='JKR'),
+)
+
+
+# Draw-pile size after the initial deal: 110 cards minus 6 for each of 4 players.
+_EXPECTED_DRAW = 110 - 4 * 6
+
+# The eight Joker-for-A/K exchange actions, built once; Card and Action are
+# frozen/hashable, so the frozenset supports O(1) membership and subset checks.
+_JOKER_SWAP_ACTIONS = frozenset(
+    Action(card=_C.JKR, pos_from=None, pos_to=None, card_swap=Card(suit=suit, rank=rank))
+    for suit in GameState.LIST_SUIT for rank in ('A', 'K')
+)
+
+
+def _all_marbles_to_kennel(state):
+    """Force the beginning phase: every marble back onto its kennel block.
+
+    Shared by every test needing this prologue; mutates in place, so the
+    caller still hands the state back through set_state."""
+    for idx, player in enumerate(state.list_player):
+        kennel = 64 + idx * 8
+        for j, marble in enumerate(player.list_marble):
+            marble.pos = kennel + j
+            marble.is_save = False
+
+
+def _setup_single_marble_turn(game, card, pos, save=False):
+    """Common prologue: the active player holds exactly ``card`` and their
+    first marble sits at ``pos``. Collapses the hand/marble writes and the
+    set_state hand-back into one call."""
+    state = game.get_state()
+    active_player = state.list_player[0]
+    active_player.list_card = [card]
+    active_player.list_marble[0].pos = pos
+    active_player.list_marble[0].is_save = save
+    game.set_state(state)
+
+
 # --- Initialization Tests ---
 
-def test_initialization(game_instance):
+def test_initialization(readonly_game_instance):
     """Test game initialization."""
-    state = game_instance.get_state()
+    state = readonly_game_instance.get_state()
     assert state.phase == GamePhase.RUNNING, "Game should start in RUNNING phase."
     assert len(state.list_player) == 4, "There should be 4 players."
-    assert len(state.list_card_draw) == 110 - (
-                4 * 6), "Draw pile should have 86 cards after dealing 6 to each of 4 players."
+    assert len(state.list_card_draw) == _EXPECTED_DRAW, \
+        "Draw pile should have 86 cards after dealing 6 to each of 4 players."
     for player in state.list_player:
         assert len(player.list_card) == 6, "Each player should start with 6 cards."
         assert len(player.list_marble) == 4, "Each player should have 4 marbles."
@@ -33,7 +108,7 @@ def test_reset_function(game_instance):
     state = game_instance.get_state()
     assert state.phase == GamePhase.RUNNING, "Game should be in RUNNING phase after reset."
     assert len(state.list_player) == 4, "There should be 4 players after reset."
-    assert len(state.list_card_draw) == 110 - (4 * 6), "Draw pile should have 86 cards after reset."
+    assert len(state.list_card_draw) == _EXPECTED_DRAW, "Draw pile should have 86 cards after reset."
     for player in state.list_player:
         assert len(player.list_card) == 6, "Each player should have 6 cards after reset."
         for marble in player.list_marble:
@@ -43,38 +118,34 @@ def test_reset_function(game_instance):
 
 # --- Path Blocking Tests ---
 
-def test_is_path_blocked_no_block(game_instance):
-    """Test path blocking when path is clear."""
-    state = game_instance.get_state()
-    game_instance.set_state(state)
-    assert not game_instance.is_path_blocked(4, 8), "Path should not be blocked when no marbles are on it."
-
-
-def test_is_path_blocked_with_block(game_instance):
-    """Test path blocking with an obstacle marble."""
-    state = game_instance.get_state()
-    # Place a safe marble at position 6 to block the path from 4 to 8
-    state.list_player[0].list_marble[0].pos = 6
-    state.list_player[0].list_marble[0].is_save = True
-    game_instance.set_state(state)
-    assert game_instance.is_path_blocked(4, 8), "Path should be blocked by a safe marble at position 6."
+@pytest.mark.parametrize("safe_pos,src,dst,expected", [
+    pytest.param(None, 4, 8, False, id="no-block"),
+    pytest.param(6, 4, 8, True, id="blocked-by-safe-marble"),
+])
+def test_is_path_blocked(game_instance, safe_pos, src, dst, expected):
+    """Test path blocking with a clear path and with a safe marble on it."""
+    if safe_pos is not None:
+        with game_instance.mutate_state() as state:
+            state.list_player[0].list_marble[0].pos = safe_pos
+            state.list_player[0].list_marble[0].is_save = True
+    assert game_instance.is_path_blocked(src, dst) == expected, \
+        f"is_path_blocked({src}, {dst}) should be {expected} with a safe marble at {safe_pos}."
 
 # --- Action Generation Tests ---
 
 def test_generate_actions_start_card(game_instance):
     """Test generating actions for A/K cards to start marbles."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign an Ace to the active player
-    active_player.list_card = [Card(suit='♠', rank='A')]
-    # Ensure one marble is in the kennel (position 64)
-    for marble in active_player.list_marble:
-        marble.pos = 64
-    game_instance.set_state(state)
+    with game_instance.mutate_state() as state:
+        active_player = state.list_player[0]
+        # Assign an Ace to the active player
+        active_player.list_card = [_C.S_A]
+        # Ensure one marble is in the kennel (position 64)
+        for marble in active_player.list_marble:
+            marble.pos = 64
     actions = game_instance.get_list_action()
     # Expect one action: moving a marble from kennel (64) to start position (0)
     expected_action = Action(
-        card=Card(suit='♠', rank='A'),
+        card=_C.S_A,
         pos_from=64,
         pos_to=0,
         card_swap=None
@@ -84,18 +155,12 @@ def test_generate_actions_start_card(game_instance):
 
 def test_generate_actions_normal_move(game_instance):
     """Test generating actions for normal forward move cards."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a '5' card to the active player
-    active_player.list_card = [Card(suit='♠', rank='5')]
-    # Place a marble at position 10
-    active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
+    # Active player holds a '5' with a marble at position 10
+    _setup_single_marble_turn(game_instance, _C.S_5, 10)
     actions = game_instance.get_list_action()
     # Expect one action: moving from 10 to 15
     expected_action = Action(
-        card=Card(suit='♠', rank='5'),
+        card=_C.S_5,
         pos_from=10,
         pos_to=15,
         card_swap=None
@@ -103,55 +168,33 @@ def test_generate_actions_normal_move(game_instance):
     assert expected_action in actions, "Should have an action to move marble from 10 to 15 using '5' card."
 
 
-def test_generate_actions_joker_beginning_phase(game_instance):
-    """Test generating actions for Joker card swaps in the beginning phase."""
+@pytest.mark.parametrize("beginning_phase", [
+    pytest.param(True, id="beginning-phase"),
+    pytest.param(False, id="non-beginning-phase"),
+])
+def test_generate_actions_joker(game_instance, beginning_phase):
+    """Test generating actions for Joker card swaps in both game phases."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
     # Assign a Joker to the active player
-    joker_card = Card(suit='', rank='JKR')
+    joker_card = _C.JKR
     active_player.list_card = [joker_card]
     # Place a marble in the kennel
     active_player.list_marble[0].pos = 64
     active_player.list_marble[0].is_save = False
-    # Ensure it's the beginning phase (all marbles >=64)
-    for player in state.list_player:
-        for marble in player.list_marble:
-            marble.pos = 64  # All marbles in kennel
-    game_instance.set_state(state)
-    actions = game_instance.get_list_action()
-    # Expect two actions:
-    # 1. Move a marble from kennel (64) to start (0)
-    # 2. Swap Joker with any 'A' or 'K'
-    expected_move_action = Action(
-        card=joker_card,
-        pos_from=64,
-        pos_to=0,
-        card_swap=None
-    )
-    assert expected_move_action in actions, "Should have an action to move marble from kennel to start using Joker."
-    # Since it's the beginning phase, swap actions should be available
-    swap_actions = [action for action in actions if action.card == joker_card and action.card_swap is not None]
-    assert len(swap_actions) > 0, "Should have at least one swap action available for Joker in beginning phase."
-
-
-def test_generate_actions_joker_non_beginning_phase(game_instance):
-    """Test generating actions for Joker card swaps in a non-beginning phase."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a Joker to the active player
-    joker_card = Card(suit='', rank='JKR')
-    active_player.list_card = [joker_card]
-    # Place a marble in the kennel
-    active_player.list_marble[0].pos = 64
-    active_player.list_marble[0].is_save = False
-    # Move one marble out of kennel to transition out of beginning phase
-    active_player.list_marble[1].pos = 0
-    active_player.list_marble[1].is_save = True
+    if beginning_phase:
+        # Ensure it's the beginning phase (all marbles in their kennels,
+        # which also keeps the active player's first marble on 64)
+        _all_marbles_to_kennel(state)
+    else:
+        # Move one marble out of kennel to transition out of beginning phase
+        active_player.list_marble[1].pos = 0
+        active_player.list_marble[1].is_save = True
     game_instance.set_state(state)
     actions = game_instance.get_list_action()
-    # Expect two actions:
+    # Expect two kinds of actions:
     # 1. Move a marble from kennel (64) to start (0)
-    # 2. Swap Joker with any card except 'JKR'
+    # 2. Swap Joker with A/K (beginning phase) or any non-Joker card
     expected_move_action = Action(
         card=joker_card,
         pos_from=64,
@@ -159,95 +202,61 @@ def test_generate_actions_joker_non_beginning_phase(game_instance):
         card_swap=None
     )
     assert expected_move_action in actions, "Should have an action to move marble from kennel to start using Joker."
-    # Since it's not the beginning phase, swap actions should be with any card except 'JKR'
     swap_actions = [action for action in actions if action.card == joker_card and action.card_swap is not None]
-    assert len(swap_actions) > 0, "Should have at least one swap action available for Joker in non-beginning phase."
+    assert len(swap_actions) > 0, "Should have at least one swap action available for Joker."
 
 
-def test_generate_actions_j_with_opponent_marbles(game_instance):
-    """Test generating actions for 'J' card when opponents have marbles to swap."""
+@pytest.mark.parametrize("with_opponent,expected_pairs", [
+    pytest.param(True, [(10, 12), (12, 10)], id="with-opponent-marbles"),
+    pytest.param(False, [(10, 15), (15, 10)], id="no-opponent-marbles"),
+])
+def test_generate_actions_j_card(game_instance, with_opponent, expected_pairs):
+    """Test generating actions for 'J' card with and without opponent marbles."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
-    opponent_player = state.list_player[1]
     # Assign a 'J' card to the active player
-    j_card = Card(suit='♠', rank='J')
+    j_card = _C.S_J
     active_player.list_card = [j_card]
     # Place active player's marble at position 10
     active_player.list_marble[0].pos = 10
     active_player.list_marble[0].is_save = False
-    # Place opponent's marble at position 12
-    opponent_player.list_marble[0].pos = 12
-    opponent_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
-    actions = game_instance.get_list_action()
-    # Expect two actions:
-    # 1. Swap active player's marble at 10 with opponent's marble at 12
-    # 2. Swap opponent's marble at 12 with active player's marble at 10
-    expected_action1 = Action(
-        card=j_card,
-        pos_from=10,
-        pos_to=12,
-        card_swap=None
-    )
-    expected_action2 = Action(
-        card=j_card,
-        pos_from=12,
-        pos_to=10,
-        card_swap=None
-    )
-    assert expected_action1 in actions, "Should have an action to swap marble from 10 to 12 using 'J' card."
-    assert expected_action2 in actions, "Should have an action to swap marble from 12 to 10 using 'J' card."
-
-
-def test_generate_actions_j_with_no_opponent_marbles(game_instance):
-    """Test generating actions for 'J' card when no opponent marbles are available to swap."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a 'J' card to the active player
-    j_card = Card(suit='♠', rank='J')
-    active_player.list_card = [j_card]
-    # Place active player's marbles on the board
-    active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
-    active_player.list_marble[1].pos = 15
-    active_player.list_marble[1].is_save = False
-    # Ensure no opponent has marbles on the board
-    for player in state.list_player[1:]:
-        for marble in player.list_marble:
-            marble.pos = 64  # In kennel
-            marble.is_save = False
+    if with_opponent:
+        # Place opponent's marble at position 12
+        opponent_player = state.list_player[1]
+        opponent_player.list_marble[0].pos = 12
+        opponent_player.list_marble[0].is_save = False
+    else:
+        # Second own marble on the board, all opponents in the kennel: the
+        # 'J' falls back to swapping the active player's own marbles.
+        active_player.list_marble[1].pos = 15
+        active_player.list_marble[1].is_save = False
+        for player in islice(state.list_player, 1, None):
+            for marble in player.list_marble:
+                marble.pos = 64  # In kennel
+                marble.is_save = False
     game_instance.set_state(state)
     actions = game_instance.get_list_action()
-    # Since no opponent marbles are available, 'J' should allow swapping between active player's marbles
-    expected_action1 = Action(
-        card=j_card,
-        pos_from=10,
-        pos_to=15,
-        card_swap=None
-    )
-    expected_action2 = Action(
-        card=j_card,
-        pos_from=15,
-        pos_to=10,
-        card_swap=None
-    )
-    assert expected_action1 in actions, "Should have an action to swap marble from 10 to 15 using 'J' card."
-    assert expected_action2 in actions, "Should have an action to swap marble from 15 to 10 using 'J' card."
+    # Each scenario expects the swap in both directions; Action is frozen
+    # and hashable, so multiple membership checks go through a set.
+    actions_set = set(actions)
+    for pos_from, pos_to in expected_pairs:
+        expected_action = Action(
+            card=j_card,
+            pos_from=pos_from,
+            pos_to=pos_to,
+            card_swap=None
+        )
+        assert expected_action in actions_set, \
+            f"Should have an action to swap marble from {pos_from} to {pos_to} using 'J' card."
 
 
 # --- Action Application Tests ---
 
 def test_apply_action_move_marble(game_instance):
     """Test applying an action to move a marble."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a '2' card to the active player
-    move_card = Card(suit='♠', rank='2')
-    active_player.list_card = [move_card]
-    # Place a marble at position 10
-    active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
+    # Active player holds a '2' with a marble at position 10
+    move_card = _C.S_2
+    _setup_single_marble_turn(game_instance, move_card, 10)
     # Define the action to move marble from 10 to 12
     action = Action(
         card=move_card,
@@ -267,14 +276,16 @@ def test_apply_action_kick_opponent(game_instance):
     active_player = state.list_player[0]
     opponent_player = state.list_player[1]
     # Assign a '2' card to the active player
-    move_card = Card(suit='♠', rank='2')
+    move_card = _C.S_2
     active_player.list_card = [move_card]
     # Place active player's marble at 10
-    active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
+    own_marble = active_player.list_marble[0]
+    own_marble.pos = 10
+    own_marble.is_save = False
     # Place opponent's marble at 12
-    opponent_player.list_marble[0].pos = 12
-    opponent_player.list_marble[0].is_save = False
+    opp_marble = opponent_player.list_marble[0]
+    opp_marble.pos = 12
+    opp_marble.is_save = False
     game_instance.set_state(state)
     # Define the action to move from 10 to 12, kicking opponent's marble
     action = Action(
@@ -292,50 +303,27 @@ def test_apply_action_kick_opponent(game_instance):
                0].pos == 72, "Opponent's marble should have been sent to kennel at 72."
 
 
-def test_apply_action_joker_swap_beginning_phase(game_instance):
-    """Test applying a Joker card swap action in the beginning phase."""
+@pytest.mark.parametrize("beginning_phase", [
+    pytest.param(True, id="beginning-phase"),
+    pytest.param(False, id="non-beginning-phase"),
+])
+def test_apply_action_joker_swap(game_instance, beginning_phase):
+    """Test applying a Joker card swap action in both game phases."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
     # Assign a Joker to the active player
-    joker_card = Card(suit='', rank='JKR')
+    joker_card = _C.JKR
     active_player.list_card = [joker_card]
-    # Define the action to swap Joker with an 'A' card
-    swap_card = Card(suit='♠', rank='A')
-    action = Action(
-        card=joker_card,
-        pos_from=None,
-        pos_to=None,
-        card_swap=swap_card
-    )
     # Ensure the active player has a marble in the kennel to allow swapping
     active_player.list_marble[0].pos = 64
     active_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
-    game_instance.apply_action(action)
-    updated_state = game_instance.get_state()
-    # Verify that the active player's card is now 'A'
-    assert updated_state.card_active == swap_card, "Card active should now be 'A' after Joker swap."
-    # Verify that Joker has been removed from the player's hand
-    assert joker_card not in updated_state.list_player[
-        0].list_card, "Joker card should be removed from player's hand after swap."
-
-
-def test_apply_action_joker_swap_non_beginning_phase(game_instance):
-    """Test applying a Joker card swap action in a non-beginning phase."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a Joker to the active player
-    joker_card = Card(suit='', rank='JKR')
-    active_player.list_card = [joker_card]
-    # Place a marble in the kennel
-    active_player.list_marble[0].pos = 64
-    active_player.list_marble[0].is_save = False
-    # Move one marble out of kennel to transition out of beginning phase
-    active_player.list_marble[1].pos = 0
-    active_player.list_marble[1].is_save = True
+    if not beginning_phase:
+        # Move one marble out of kennel to transition out of beginning phase
+        active_player.list_marble[1].pos = 0
+        active_player.list_marble[1].is_save = True
     game_instance.set_state(state)
     # Define the action to swap Joker with an 'A' card
-    swap_card = Card(suit='♠', rank='A')
+    swap_card = _C.S_A
     action = Action(
         card=joker_card,
         pos_from=None,
@@ -351,139 +339,168 @@ def test_apply_action_joker_swap_non_beginning_phase(game_instance):
         0].list_card, "Joker card should be removed from player's hand after swap."
 
 
-def test_apply_action_seven_card_final_move(game_instance):
-    """Test applying a SEVEN card's final move."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a '7' card to the active player and set steps_remaining to 2
-    seven_card = Card(suit='♠', rank='7')
-    active_player.list_card = [seven_card]
-    game_instance.steps_remaining = 2
-    active_player.list_marble[0].pos = 76
-    active_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
-    # Define the action to move from 76 to 78 (2 steps)
-    action = Action(
-        card=seven_card,
-        pos_from=76,
-        pos_to=78,
-        card_swap=None
-    )
-    game_instance.apply_action(action)
-    updated_state = game_instance.get_state()
-    # Verify the marble has moved to 78
-    assert updated_state.list_player[0].list_marble[
-               0].pos == 78, "Marble should have moved from 76 to 78 using SEVEN card."
-    # Verify steps_remaining is reset
-    assert game_instance.steps_remaining is None, "Steps remaining should be None after completing SEVEN card actions."
-    # Verify SEVEN card is removed from player's hand
-    assert seven_card not in updated_state.list_player[
-        0].list_card, "SEVEN card should be removed from player's hand after completion."
-
-
-def test_apply_action_seven_card_exceed_steps(game_instance):
-    """Test applying a SEVEN card exceeding remaining steps."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a '7' card to the active player and set steps_remaining to 2
-    seven_card = Card(suit='♠', rank='7')
-    active_player.list_card = [seven_card]
-    game_instance.steps_remaining = 2
-    active_player.list_marble[0].pos = 76
-    active_player.list_marble[0].is_save = False
-    game_instance.set_state(state)
-    # Define the action to move from 76 to 80 (4 steps), exceeding remaining steps
+@pytest.fixture
+def seven_card_game(game_instance):
+    """Factory: game mid-SEVEN with a marble at ``pos`` and ``steps`` left."""
+    def _setup(pos, steps):
+        game_instance.steps_remaining = steps
+        _setup_single_marble_turn(game_instance, _C.S_7, pos)
+        return game_instance
+    return _setup
+
+
+@pytest.mark.parametrize("pos_from,steps,pos_to,valid", [
+    pytest.param(76, 2, 78, True, id="final-move"),
+    pytest.param(76, 2, 80, False, id="exceed-steps"),
+    pytest.param(10, 1, 15, False, id="exceed-steps-by-four"),
+])
+def test_apply_action_seven_card(seven_card_game, pos_from, steps, pos_to, valid):
+    """Test the SEVEN card's final move and its step-overrun rejection."""
+    game = seven_card_game(pos_from, steps)
     action = Action(
-        card=seven_card,
-        pos_from=76,
-        pos_to=80,
+        card=_C.S_7,
+        pos_from=pos_from,
+        pos_to=pos_to,
         card_swap=None
     )
-    # Applying this action should raise a ValueError
-    with pytest.raises(ValueError, match="Exceeded remaining steps for SEVEN."):
-        game_instance.apply_action(action)
-    updated_state = game_instance.get_state()
-    # Marble should remain at 76
-    assert updated_state.list_player[0].list_marble[0].pos == 76, "Marble should not move when exceeding steps."
-    # Steps_remaining should remain unchanged
-    assert game_instance.steps_remaining == 2, "Steps remaining should not change when action is invalid."
-
-
-def test_apply_action_j_swap_with_opponent_marble(game_instance):
-    """Test applying a 'J' card to swap with an opponent's marble."""
+    if valid:
+        game.apply_action(action)
+        updated_state = game.get_state()
+        # Verify the marble has moved to pos_to
+        assert updated_state.list_player[0].list_marble[
+                   0].pos == pos_to, "Marble should have moved to pos_to using SEVEN card."
+        # Verify steps_remaining is reset
+        assert game.steps_remaining is None, \
+            "Steps remaining should be None after completing SEVEN card actions."
+        # Verify SEVEN card is removed from player's hand
+        assert _C.S_7 not in updated_state.list_player[
+            0].list_card, "SEVEN card should be removed from player's hand after completion."
+    else:
+        # Moving further than the remaining steps should raise a ValueError
+        with pytest.raises(ValueError, match="Exceeded remaining steps for SEVEN."):
+            game.apply_action(action)
+        updated_state = game.get_state()
+        # Marble should not move
+        assert updated_state.list_player[0].list_marble[
+                   0].pos == pos_from, "Marble should not move when exceeding steps."
+        # Steps_remaining should remain unchanged
+        assert game.steps_remaining == steps, "Steps remaining should not change when action is invalid."
+
+
+@pytest.mark.parametrize("with_opponent", [
+    pytest.param(True, id="swap-with-opponent"),
+    pytest.param(False, id="no-marble-at-target"),
+])
+def test_apply_action_j_swap(game_instance, with_opponent):
+    """Test applying a 'J' card swap with and without an opponent marble at the target."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
-    opponent_player = state.list_player[1]
     # Assign a 'J' card to the active player
-    j_card = Card(suit='♠', rank='J')
+    j_card = _C.S_J
     active_player.list_card = [j_card]
     # Place active player's marble at 10
     active_player.list_marble[0].pos = 10
     active_player.list_marble[0].is_save = False
-    # Place opponent's marble at 12
-    opponent_player.list_marble[0].pos = 12
-    opponent_player.list_marble[0].is_save = False
+    if with_opponent:
+        # Place opponent's marble at the target position 12
+        state.list_player[1].list_marble[0].pos = 12
+        state.list_player[1].list_marble[0].is_save = False
+        pos_to = 12
+    else:
+        # Ensure no opponent has a marble at the target position 15
+        for player in islice(state.list_player, 1, None):
+            for marble in player.list_marble:
+                marble.pos = 20  # Different position
+                marble.is_save = False
+        pos_to = 15
     game_instance.set_state(state)
-    # Define the action to swap active player's marble at 10 with opponent's at 12
     action = Action(
         card=j_card,
         pos_from=10,
-        pos_to=12,
+        pos_to=pos_to,
         card_swap=None
     )
     game_instance.apply_action(action)
     updated_state = game_instance.get_state()
-    # Verify active player's marble is now at 12
-    assert updated_state.list_player[0].list_marble[0].pos == 12, "Active player's marble should have moved to 12."
-    # Verify opponent's marble is now at 10
-    assert updated_state.list_player[1].list_marble[0].pos == 10, "Opponent's marble should have moved to 10."
-
-
-def test_apply_action_j_swap_no_opponent_marble(game_instance):
-    """Test applying a 'J' card when no opponent's marble is present at target position."""
+    if with_opponent:
+        # Verify both marbles changed places
+        assert updated_state.list_player[0].list_marble[0].pos == 12, "Active player's marble should have moved to 12."
+        assert updated_state.list_player[1].list_marble[0].pos == 10, "Opponent's marble should have moved to 10."
+    else:
+        # Marble should remain at 10 and no opponent marble may appear at 15
+        assert updated_state.list_player[0].list_marble[
+                   0].pos == 10, "Marble should not move when no opponent's marble is present."
+        for player in islice(updated_state.list_player, 1, None):
+            for marble in player.list_marble:
+                assert marble.pos != 15, "No opponent's marble should be at 15."
+
+
+def test_apply_action_j_swap_keeps_masks_in_sync(game_instance):
+    """Regression: a J swap must not wipe the bits of the square the mover
+    lands on (both marbles transiently share it mid-swap)."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
-    # Assign a 'J' card to the active player
-    j_card = Card(suit='♠', rank='J')
-    active_player.list_card = [j_card]
-    # Place active player's marble at 10
+    active_player.list_card = [_C.S_J]
+    # Saved mover at 10, opponent marble at 12
     active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
-    # Ensure no opponent has a marble at 15
-    for player in state.list_player[1:]:
-        for marble in player.list_marble:
-            marble.pos = 20  # Different position
-            marble.is_save = False
-    game_instance.set_state(state)
-    # Define the action to swap active player's marble at 10 with opponent's at 15 (no marble there)
-    action = Action(
-        card=j_card,
-        pos_from=10,
-        pos_to=15,
-        card_swap=None
-    )
-    # Applying this action should not change any marbles
-    game_instance.apply_action(action)
+    active_player.list_marble[0].is_save = True
+    state.list_player[1].list_marble[0].pos = 12
+    state.list_player[1].list_marble[0].is_save = False
+    game_instance.set_state(state)
+    game_instance.apply_action(Action(card=_C.S_J, pos_from=10, pos_to=12, card_swap=None))
+    # The still-saved mover now sits on 12 and must keep blocking paths over it
+    assert game_instance.is_path_blocked(11, 13), \
+        "Saved marble on 12 should still block the path after the swap."
+    # The incrementally maintained masks must match a full rebuild
+    occ_mask, save_mask = game_instance._occ_mask, game_instance._save_mask
+    game_instance._rebuild_masks()
+    assert (game_instance._occ_mask, game_instance._save_mask) == (occ_mask, save_mask), \
+        "Incremental mask updates should match a rebuild after a J swap."
+
+
+def test_partner_move_through_occupied_square_keeps_masks_in_sync(game_instance):
+    """Regression: a finished player's partner-support move lands on an
+    occupied square without capturing; moving off it again must not erase
+    the resident marble's occupancy."""
+    state = game_instance.get_state()
+    active_player = state.list_player[0]
+    # Player 0 finished: all marbles in the own finish block
+    for j, marble in enumerate(active_player.list_marble):
+        marble.pos = 68 + j
+        marble.is_save = False
+    active_player.list_card = [_C.S_5, _C.S_2]
+    # Partner marble at 10, opponent marble resident on 15
+    state.list_player[2].list_marble[0].pos = 10
+    state.list_player[2].list_marble[0].is_save = False
+    state.list_player[1].list_marble[0].pos = 15
+    state.list_player[1].list_marble[0].is_save = False
+    game_instance.set_state(state)
+    # Move the partner marble onto 15 (no capture), then off to 17
+    game_instance.apply_action(Action(card=_C.S_5, pos_from=10, pos_to=15, card_swap=None))
+    game_instance.apply_action(Action(card=_C.S_2, pos_from=15, pos_to=17, card_swap=None))
     updated_state = game_instance.get_state()
-    # Marble should remain at 10
-    assert updated_state.list_player[0].list_marble[
-               0].pos == 10, "Marble should not move when no opponent's marble is present."
-    # No marbles should be at 15
-    for player in updated_state.list_player[1:]:
-        for marble in player.list_marble:
-            assert marble.pos != 15, "No opponent's marble should be at 15."
+    # The opponent marble never moved and must still be tracked on 15
+    assert updated_state.list_player[1].list_marble[0].pos == 15, \
+        "Resident opponent marble should still sit on 15."
+    assert game_instance._occ_mask & (1 << 15), \
+        "Occupancy bit of the resident marble must survive the vacate."
+    occ_mask, save_mask = game_instance._occ_mask, game_instance._save_mask
+    game_instance._rebuild_masks()
+    assert (game_instance._occ_mask, game_instance._save_mask) == (occ_mask, save_mask), \
+        "Incremental mask updates should match a rebuild after the sequence."
 
 
 
 # --- SEVEN Card Logic Tests ---
 
+@pytest.mark.slow
 def test_seven_card_partial_steps(game_instance):
     """Test SEVEN card handling for partial steps."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
 
     # Assign SEVEN card to active player and set marbles
-    seven_card = Card(suit='♠', rank='7')
+    seven_card = _C.S_7
     state.card_active = seven_card
     game_instance.steps_remaining = 7
     active_player.list_card = [seven_card]
@@ -505,29 +522,11 @@ def test_seven_card_partial_steps(game_instance):
     assert game_instance.steps_remaining == 0, "Steps remaining should be 0 after SEVEN card completion."
 
 
-def test_seven_card_steps_exceeding_limit(game_instance):
-    """Test SEVEN card where steps exceed the allowed moves."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    
-    # Set SEVEN card and steps_remaining
-    seven_card = Card(suit='♠', rank='7')
-    state.card_active = seven_card
-    game_instance.steps_remaining = 1
-    active_player.list_card = [seven_card]
-    active_player.list_marble[0].pos = 10
-    
-    # Attempt to move more than 1 step
-    invalid_action = Action(card=seven_card, pos_from=10, pos_to=15)
-    game_instance.set_state(state)
-    with pytest.raises(ValueError, match="Exceeded remaining steps for SEVEN."):
-        game_instance.apply_action(invalid_action)
-
 def test_seven_card_reset_steps(game_instance):
     """Test that steps_remaining resets correctly after SEVEN card completion."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
-    seven_card = Card(suit='♠', rank='7')
+    seven_card = _C.S_7
     state.card_active = seven_card
     active_player.list_card = [seven_card]
     game_instance.steps_remaining = 0
@@ -537,39 +536,7 @@ def test_seven_card_reset_steps(game_instance):
     game_instance.apply_action(None)  # End turn
     assert game_instance.steps_remaining is None, "Steps remaining should reset to None after turn completion."
 
-def test_seven_card_handling():
-    """Test SEVEN card handling at specific positions"""
-    game = Dog()
-    state = game.get_state()
-    active_player = state.list_player[0]
-    
-    # Set up the SEVEN card as active
-    seven_card = Card(suit='♠', rank='7')
-    state.card_active = seven_card
-    active_player.list_card = [seven_card]
-    state.bool_card_exchanged = True  # Add this to prevent card exchange actions
-    
-    # Test case 1: Marble at position 12
-    active_player.list_marble[0].pos = 12
-    game.steps_remaining = 7
-    game.set_state(state)
-    
-    actions = game.get_list_action()
-    print(f"Test case 1 - Marble at 12, steps=7:")
-    for action in actions:
-        print(f"  Action: from {action.pos_from} to {action.pos_to}")
-    
-    # Test case 2: Marble at position 76
-    active_player.list_marble[0].pos = 76
-    game.steps_remaining = 2
-    game.set_state(state)
-    
-    actions = game.get_list_action()
-    print(f"Test case 2 - Marble at 76, steps=2:")
-    for action in actions:
-        print(f"  Action: from {action.pos_from} to {action.pos_to}")
-
-# lines 203-220
+@pytest.mark.slow
 def test_seven_card_special_positions():
     """Test SEVEN card handling at positions 12 and 76"""
     game_instance = Dog()
@@ -577,7 +544,7 @@ def test_seven_card_special_positions():
     active_player = state.list_player[0]
     
     # Setup initial state
-    seven_card = Card(suit='♠', rank='7')
+    seven_card = _C.S_7
     active_player.list_card = [seven_card]
     state.bool_card_exchanged = True
     
@@ -606,19 +573,6 @@ def test_seven_card_special_positions():
     assert actions[0].pos_from == 76, "Action should start from position 76"
     assert actions[0].pos_to == 78, "Action should move to position 78"
 
-# --- Path Blocking Tests ---
-
-def test_is_path_blocked_logic(game_instance):
-    """Test path blocking logic."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-
-    # Block path by placing marble at position 6
-    active_player.list_marble[0].pos = 6
-    active_player.list_marble[0].is_save = True  # Added this line to make marble blocking
-    game_instance.set_state(state)
-    assert game_instance.is_path_blocked(4, 8), "Path should be blocked by marble at position 6."
-
 # --- Card Comparison Tests ---
 
 def test_card_comparison():
@@ -636,6 +590,7 @@ def test_card_comparison():
 
 # --- Game Progression Tests ---
 
+@pytest.mark.slow
 def test_round_progression(game_instance):
     """Test if the game progresses to the next round correctly."""
     game_instance.reset()  # Ensure starting from a fresh state
@@ -661,8 +616,8 @@ def test_round_progression(game_instance):
     game_instance.set_state(state)
 
     # Check available actions before applying
-    available_actions = game_instance.get_list_action()
-    assert len(available_actions) == 0, "There should be no available actions for the active player."
+    assert not game_instance.has_available_actions(), \
+        "There should be no available actions for the active player."
 
     # Apply action to simulate end of turn
     game_instance.apply_action(None)
@@ -692,40 +647,6 @@ def test_round_progression(game_instance):
         assert len(player.list_card) == expected_cards_per_player, \
             f"Each player should have {expected_cards_per_player} cards in round {updated_state.cnt_round}."
 
-# --- Additional Edge Case Tests ---
-
-def test_apply_action_swap_without_opponent_marble(game_instance):
-    """Test swapping with a marble when no opponent's marble is present."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    # Assign a 'J' card to the active player
-    swap_card = Card(suit='♠', rank='J')
-    active_player.list_card = [swap_card]
-    # Place active player's marble at position 10
-    active_player.list_marble[0].pos = 10
-    active_player.list_marble[0].is_save = False
-    # Ensure no opponent has a marble at position 15
-    for player in state.list_player[1:]:
-        for marble in player.list_marble:
-            marble.pos = 20  # Different position
-            marble.is_save = False
-    game_instance.set_state(state)
-    # Define the action to swap active player's marble with a non-existent opponent's marble
-    action = Action(
-        card=swap_card,
-        pos_from=10,
-        pos_to=15,
-        card_swap=None
-    )
-    # Applying this action should not change any marbles
-    game_instance.apply_action(action)
-    updated_state = game_instance.get_state()
-    # Marble should remain at 10
-    assert updated_state.list_player[0].list_marble[
-               0].pos == 10, "Marble should not move when no opponent's marble is present."
-
-
-
 # --- Comprehensive Coverage Tests ---
 
 def test_apply_action_joker_swap_all_possible_swaps(game_instance):
@@ -733,22 +654,17 @@ def test_apply_action_joker_swap_all_possible_swaps(game_instance):
     state = game_instance.get_state()
     active_player = state.list_player[0]
     # Assign a Joker to the active player
-    joker_card = Card(suit='', rank='JKR')
+    joker_card = _C.JKR
     active_player.list_card = [joker_card]
-    # Place a marble in the kennel
-    active_player.list_marble[0].pos = 64
-    active_player.list_marble[0].is_save = False
-    # Ensure it's the beginning phase (all marbles >=64)
-    for player in state.list_player:
-        for marble in player.list_marble:
-            marble.pos = 64  # All marbles in kennel
+    # Ensure it's the beginning phase with every marble in its kennel
+    # (the active player's first marble lands on 64, the kennel exit)
+    _all_marbles_to_kennel(state)
     game_instance.set_state(state)
     actions = game_instance.get_list_action()
-    # There should be multiple swap actions for all A and K suits
-    swap_cards = [Card(suit=suit, rank=rank) for suit in GameState.LIST_SUIT for rank in ['A', 'K']]
-    swap_actions = [action for action in actions if action.card == joker_card and action.card_swap in swap_cards]
-    assert len(swap_actions) == len(
-        GameState.LIST_SUIT) * 2, f"Should have {len(GameState.LIST_SUIT) * 2} swap actions for Joker."
+    # There should be one swap action per A and K card value; a single
+    # subset check against the precomputed set covers all eight.
+    assert _JOKER_SWAP_ACTIONS.issubset(actions), \
+        f"Should have {len(_JOKER_SWAP_ACTIONS)} swap actions for Joker."
 
 
 
@@ -756,15 +672,10 @@ def test_apply_action_joker_swap_all_possible_swaps(game_instance):
 
 def test_random_player_selects_valid_action(game_instance):
     """Test that RandomPlayer selects a valid action from the available actions."""
-    # Assuming RandomPlayer class is properly implemented
-    # For this test, we'll mock the RandomPlayer's select_action method
-    from server.py.dog import RandomPlayer
-    import random
-
     state = game_instance.get_state()
     active_player = state.list_player[0]
     # Assign multiple actions to the active player
-    active_player.list_card = [Card(suit='♠', rank='2'), Card(suit='♥', rank='3')]
+    active_player.list_card = [_C.S_2, _C.H_3]
     active_player.list_marble[0].pos = 10
     active_player.list_marble[0].is_save = False
     active_player.list_marble[1].pos = 20
@@ -779,9 +690,6 @@ def test_random_player_selects_valid_action(game_instance):
 
 def test_random_player_no_action(game_instance):
     """Test that RandomPlayer returns None when no actions are available."""
-    from server.py.dog import RandomPlayer
-    import random
-
     state = game_instance.get_state()
     active_player = state.list_player[0]
     # Clear active player's hand and set marbles in finish to ensure no actions
@@ -797,39 +705,48 @@ def test_random_player_no_action(game_instance):
 
 # --- Cleanup and Teardown Tests ---
 
-def test_game_continue_if_no_winner(game_instance):
-    """Test that the game continues if no team has won."""
+@pytest.mark.parametrize("partner_pos,team_finished", [
+    pytest.param(60, False, id="partner-still-on-board"),
+    pytest.param(84, True, id="both-teams-finished"),
+])
+def test_end_of_round_transitions(game_instance, partner_pos, team_finished):
+    """Test end-of-round handling with and without a finished team."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
     partner_player = state.list_player[2]
-    # Set active player's marbles to positions >=68
+    # Set active player's marbles to finish positions (>= 68)
     for marble in active_player.list_marble:
         marble.pos = 68
-    # Set partner player's marbles to positions <68
+    # Partner either still on the board (60) or in their finish (84)
     for marble in partner_player.list_marble:
-        marble.pos = 60
-    # Ensure there are actions available
-    active_player.list_card = []
-    partner_player.list_card = []
-    game_instance.set_state(state)
-    # Apply action to check that game continues
-    game_instance.apply_action(None)
-    updated_state = game_instance.get_state()
-    assert updated_state.phase == GamePhase.RUNNING, "Game should continue running when no team has won."
+        marble.pos = partner_pos
+    if team_finished:
+        state.phase = GamePhase.FINISHED  # Set phase manually since we're testing state
+        game_instance.set_state(state)
+        # With both teams done, not even partner-support actions remain
+        assert not game_instance.has_available_actions(), \
+            "No actions should be available when all marbles are in finish."
+        assert game_instance.get_state().phase == GamePhase.FINISHED, \
+            "Game phase should be FINISHED when all marbles are done."
+    else:
+        # Clear the hands so the turn simply passes
+        active_player.list_card = []
+        partner_player.list_card = []
+        game_instance.set_state(state)
+        game_instance.apply_action(None)
+        assert game_instance.get_state().phase == GamePhase.RUNNING, \
+            "Game should continue running when no team has won."
 
 
 def test_apply_action_exchange_card(game_instance):
     """Test exchanging a card between players."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-    partner_player = state.list_player[2]
-    # Assign a card to active player
-    exchange_card = Card(suit='♠', rank='5')
-    active_player.list_card = [exchange_card]
-    # Ensure it's round 0 and no card has been exchanged
-    state.cnt_round = 0
-    state.bool_card_exchanged = False
-    game_instance.set_state(state)
+    exchange_card = _C.S_5
+    with game_instance.mutate_state() as state:
+        # Assign a card to active player
+        state.list_player[0].list_card = [exchange_card]
+        # Ensure it's round 0 and no card has been exchanged
+        state.cnt_round = 0
+        state.bool_card_exchanged = False
     # Define the action to exchange the card
     action = Action(
         card=exchange_card,
@@ -850,30 +767,7 @@ def test_apply_action_exchange_card(game_instance):
 
 # --- Endgame Logic Tests ---
 
-def test_endgame_detection(game_instance):
-    """Test detection of endgame condition."""
-    state = game_instance.get_state()
-    active_player = state.list_player[0]
-
-    # Move all marbles to finish positions
-    for marble in active_player.list_marble:
-        marble.pos = 68  # Finish position
-    
-    # Move partner's marbles to finish as well (needed for game end)
-    partner_idx = (state.idx_player_active + 2) % state.cnt_player
-    partner_player = state.list_player[partner_idx]
-    for marble in partner_player.list_marble:
-        marble.pos = 84  # Partner's finish position (68 + 16)
-        
-    state.phase = GamePhase.FINISHED  # Set phase manually since we're testing state
-    game_instance.set_state(state)
-
-    actions = game_instance.get_list_action()
-    assert len(actions) == 0, "No actions should be available when all marbles are in finish."
-    assert state.phase == GamePhase.FINISHED, "Game phase should be FINISHED when all marbles are done."
-
-
-def test_apply_action_partner_marble_when_finished(game_instance, capsys):
+def test_apply_action_partner_marble_when_finished(game_instance, caplog):
     """Test moving partner's marble when active player's marbles are finished."""
     state = game_instance.get_state()
     active_player = state.list_player[0]
@@ -884,7 +778,7 @@ def test_apply_action_partner_marble_when_finished(game_instance, capsys):
         marble.pos = 68  # Finish positions
 
     # Step 2: Assign a valid card to the active player
-    move_card = Card(suit='♠', rank='5')
+    move_card = _C.S_5
     active_player.list_card = [move_card]
 
     # Step 3: Set a partner marble at pos_from (10)
@@ -919,9 +813,51 @@ def test_apply_action_partner_marble_when_finished(game_instance, capsys):
     )
 
     game_instance.set_state(state)
-    game_instance.apply_action(invalid_action)
+    with caplog.at_level(logging.DEBUG, logger="server.py.dog"):
+        game_instance.apply_action(invalid_action)
 
     # Capture and verify the debug output
-    captured = capsys.readouterr()
-    assert f"DEBUG: No Partner Marble Found at {invalid_action.pos_from}" in captured.out, \
-        "Debug message should print when no partner marble is found."
\ No newline at end of file
+    assert f"No partner marble found at {invalid_action.pos_from}" in caplog.text, \
+        "Debug message should be logged when no partner marble is found."
+
+def test_get_list_action_repeated_calls_are_stable(game_instance):
+    """Repeated queries on an unchanged state return the same actions and
+    callers may freely mutate the returned list."""
+    first = game_instance.get_list_action()
+    second = game_instance.get_list_action()
+    assert first == second, "Same state should yield the same action list."
+
+    first.clear()
+    third = game_instance.get_list_action()
+    assert third == second, "Mutating a returned list must not affect later calls."
+
+def test_clone_is_independent(game_instance):
+    """Applying an action to a clone leaves the original game untouched."""
+    # Use the exchange phase so an action is guaranteed regardless of the deal.
+    state = game_instance.get_state()
+    state.cnt_round = 0
+    state.bool_card_exchanged = False
+    game_instance.set_state(state)
+    snapshot = state.model_copy(deep=True)
+
+    copy = game_instance.clone()
+    assert copy.get_state() == snapshot, "Clone should start from the same state."
+
+    actions = copy.get_list_action()
+    assert actions, "Exchange phase should offer one action per hand card."
+    copy.apply_action(actions[0])
+
+    assert game_instance.get_state() == snapshot, \
+        "Mutating the clone must not change the original game."
+    assert copy.get_state() != snapshot, \
+        "The clone itself should have advanced."
+
+def test_pickle_round_trip(game_instance):
+    """A pickled game restores its state and rebuilds the derived caches."""
+    import pickle
+
+    restored = pickle.loads(pickle.dumps(game_instance))
+    assert restored.get_state() == game_instance.get_state(), \
+        "Round-tripped game should carry the same state."
+    assert restored.get_list_action() == game_instance.get_list_action(), \
+        "Round-tripped game should produce the same actions."